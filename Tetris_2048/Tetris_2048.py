@@ -1,9 +1,16 @@
 import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
-from lib.picture import Picture  # used for displaying images
+import lib.picture as picture  # used for loading the images displayed in the menus
 from lib.color import Color  # used for coloring the game menu
 import os  # the os module is used for file and directory operations
 from game_grid import GameGrid  # the class for modeling the game grid
 from tetromino import Tetromino  # the class for modeling the tetrominoes
+from game_clock import GameClock  # the class for scheduling gravity steps and frames
+from simulation import Simulation  # the class for running the game on its own thread
+from animation import AnimationTimeline  # used for playing back the lock steps of the snapshots
+from leaderboard import Leaderboard  # the class for storing the scores of the finished games
+from telemetry import TelemetryWriter  # the class for streaming the gameplay metrics to the disk
+from savegame import save_game, load_game, delete_saved_game  # used for resuming the game on the next launch
+import time  # used for measuring the duration of the games
 import random  # used for creating tetrominoes with random types/shapes
 
 # Configuration dictionaries for using colors, texts, and dimensions in the game
@@ -59,6 +66,10 @@ dimensions = {
     'SLIDER_BAR_Y_SPEED': 350,
     'SPEED_MAX_VALUE': 500,
     'SPEED_MIN_VALUE': 50,
+    'TARGET_FPS': 60,
+    'ANIMATION_SPEED': 80,
+    'MENU_WAIT_TIMEOUT': 1000,
+    'AUTOSAVE_INTERVAL': 10000,
     'MENU_IMAGE_PATH': "/images/menu_image.png",
     'GAME_OVER_LOSE_PATH': "/images/loseMenu_image.png",
     'GAME_OVER_WIN_PATH': "/images/winMenu_image.png",
@@ -66,63 +77,162 @@ dimensions = {
     'CONTROLS_IMAGE_PATH': "/images/controls_image.png",
 }
 
+# the leaderboard, the telemetry writer and the path of the saved game, opened by start() next to this file
+leaderboard, telemetry, save_file_path = None, None, None
 
-# Main program function for starting the game and handling user input
+
+# Main program function for starting the game
+# The screens of the game are the states of a state machine driven by this single loop:
+# menu -> settings -> playing <-> paused, and playing -> game over -> playing (play again) or menu
+# Leaving a game drops the only reference to its game grid, so the memory use stays flat however
+# many times the game is restarted
 def start():
-    file_path = os.path.join(os.path.dirname(__file__), "best_score.txt")
-    max_score = read_max_score_from_file(file_path)
-    stddraw.setXscale(-0.5, dimensions['GRID_WIDTH'])
-    stddraw.setYscale(-0.5, dimensions['GRID_HEIGHT'])
-    display_game_menu(dimensions['GRID_WIDTH'], dimensions['GRID_HEIGHT'], max_score)
-    grid_h, grid_w, game_speed = display_settings_screen()
-    game_w = grid_w + dimensions['INFO_WIDTH']
-    stddraw.setXscale(-0.5, game_w - 0.5)
-    stddraw.setYscale(-0.5, grid_h - 0.5)
+    open_game_files()
+    state = 'menu'
+    grid, clock, game_start_time = None, None, None
+    while True:
+        if state == 'menu':
+            grid = None
+            stddraw.setXscale(-0.5, dimensions['GRID_WIDTH'])
+            stddraw.setYscale(-0.5, dimensions['GRID_HEIGHT'])
+            display_game_menu(dimensions['GRID_WIDTH'], dimensions['GRID_HEIGHT'], leaderboard.best_score())
+            # resume the game saved on the last pause or autosave, if there is one
+            grid = load_game(save_file_path, dimensions['INFO_WIDTH'], dimensions['ANIMATION_SPEED'])
+            if grid is None:
+                state = 'settings'
+            else:
+                grid.max_score = max(leaderboard.best_score(), grid.max_score)
+                state = 'playing'
+        elif state == 'settings':
+            grid_h, grid_w, game_speed = display_settings_screen()
+            grid = create_game_grid(grid_h, grid_w, game_speed)
+            state = 'playing'
+        elif state == 'playing':
+            # a new game is started (or a saved game is resumed) unless the game is resumed after a pause
+            if clock is None:
+                # gravity steps follow the game speed while input and rendering run at the target frame rate
+                clock = GameClock(grid.game_speed, dimensions['TARGET_FPS'])
+                game_start_time = time.perf_counter()
+            else:
+                clock.reset()
+            state = play(grid, clock, game_start_time)
+            if state != 'paused':
+                clock = None
+        elif state == 'paused':
+            # the game is saved on every pause, so it can be resumed even if the window is closed
+            save_game(save_file_path, grid)
+            if display_pause_screen(grid.score):
+                state = 'playing'
+            else:
+                delete_saved_game(save_file_path)
+                clock = None
+                state = 'menu'
+        elif state == 'game_over':
+            if display_game_over_screen(grid.grid_height, grid.grid_width + dimensions['INFO_WIDTH'], grid.score):
+                grid = create_game_grid(grid.grid_height, grid.grid_width, grid.game_speed)
+                state = 'playing'
+            else:
+                state = 'menu'
+
+
+# Function for opening the files of the game next to this file, unless they are already open
+def open_game_files():
+    global leaderboard, telemetry, save_file_path
+    if leaderboard is not None:
+        return
+    game_dir = os.path.dirname(os.path.realpath(__file__))
+    # the scores of the finished games (the best score of the old best_score.txt is imported once)
+    leaderboard = Leaderboard(os.path.join(game_dir, "leaderboard.db"), os.path.join(game_dir, "best_score.txt"))
+    # the gameplay metrics (locks, games and input latencies) are appended to this file during play
+    telemetry = TelemetryWriter(os.path.join(game_dir, "telemetry.jsonl.gz"))
+    # the game in progress is saved to this file on every pause and periodically
+    save_file_path = os.path.join(game_dir, "saved_game.bin")
+
+
+# Function for creating the game grid of a new game with its current and next tetromino
+def create_game_grid(grid_h, grid_w, game_speed):
     Tetromino.grid_height = grid_h
     Tetromino.grid_width = grid_w
-    grid = GameGrid(grid_h, grid_w, dimensions['INFO_WIDTH'], game_speed)
-    current_tetromino = create_tetromino()
-    grid.current_tetromino = current_tetromino
-    next_tetromino = create_tetromino()
-    grid.next_tetromino = next_tetromino
-    grid.max_score = max_score
+    grid = GameGrid(grid_h, grid_w, dimensions['INFO_WIDTH'], game_speed, dimensions['ANIMATION_SPEED'])
+    grid.current_tetromino = create_tetromino()
+    grid.next_tetromino = create_tetromino()
+    grid.max_score = leaderboard.best_score()
+    return grid
+
+
+# Function for playing the game on the given game grid and handling user input
+# The game runs on the simulation thread, and this function is the render loop: it sends the keys to the
+# simulation and draws the latest snapshot of the game grid at the target frame rate
+# Returns the next state of the game: 'paused', 'game_over' or 'menu' (when the game is restarted)
+def play(grid, clock, game_start_time):
+    stddraw.setXscale(-0.5, grid.grid_width + dimensions['INFO_WIDTH'] - 0.5)
+    stddraw.setYscale(-0.5, grid.grid_height - 0.5)
+    next_autosave_time = time.perf_counter() + dimensions['AUTOSAVE_INTERVAL'] / 1000
+    # the steps of each lock are played back on the render loop's own timeline
+    animations = AnimationTimeline(dimensions['ANIMATION_SPEED'])
+    shown_lock_count = grid.lock_count
+    simulation = Simulation(grid, clock, create_tetromino, record_lock)
+    simulation.start()
 
     while True:
-        if stddraw.hasNextKeyTyped():
-            key_typed = stddraw.nextKeyTyped()
-            if key_typed == "escape":
-                display_pause_screen(grid.score)
-            elif key_typed in ["left", "right", "down"]:
-                current_tetromino.move(key_typed, grid)
-            elif key_typed in ["d", "a"]:
-                current_tetromino.rotate(key_typed)
-            elif key_typed == "space":
-                while current_tetromino.can_be_moved("down", grid):
-                    current_tetromino.move("down", grid)
-            elif key_typed == "r":
-                start()
-            stddraw.clearKeysTyped()
-
-        success = current_tetromino.move("down", grid)
-        if not success:
-            tiles, pos = grid.current_tetromino.get_min_bounded_tile_matrix(True)
-            game_over = grid.update_grid(tiles, pos)
-            if game_over:
-                if grid.score > max_score:
-                    max_score = grid.score
-                    write_max_score_to_file(max_score, file_path)
-                is_restarted = display_game_over_screen(grid_h, game_w, grid.score)
-                if is_restarted:
-                    grid = GameGrid(grid_h, grid_w, dimensions['INFO_WIDTH'], game_speed)
-                    grid.max_score = max_score
-                elif not is_restarted:
-                    start()
-            current_tetromino = next_tetromino
-            next_tetromino = create_tetromino()
-            grid.current_tetromino = current_tetromino
-            grid.next_tetromino = next_tetromino
-
-        grid.display()
+        # send every key typed since the last frame to the simulation in the order they were typed
+        for key_typed, typed_time in stddraw.nextKeyEvents():
+            if key_typed in ("escape", "r"):
+                simulation.stop()
+                # the game may have ended on the simulation thread since the last snapshot, and a finished
+                # game cannot be paused or left without recording it
+                if grid.game_over:
+                    finish_game(grid, game_start_time)
+                    return 'game_over'
+                if key_typed == "escape":
+                    # the keys typed before the game was paused are not applied after resuming
+                    stddraw.clearKeysTyped()
+                    return 'paused'
+                delete_saved_game(save_file_path)
+                return 'menu'
+            simulation.send_key(key_typed, typed_time)
+
+        # the keys are taken before the snapshot, so the snapshot shows the effect of all of them
+        applied_keys = simulation.take_applied_keys()
+        snapshot = simulation.latest_snapshot()
+        if snapshot.game_over:
+            simulation.stop()
+            finish_game(grid, game_start_time)
+            return 'game_over'
+        if snapshot.lock_count != shown_lock_count:
+            animations.clear()
+            for kind, number_matrix in snapshot.lock_frames:
+                animations.add(kind, number_matrix)
+            shown_lock_count = snapshot.lock_count
+
+        grid.draw_snapshot(snapshot, animations)
+        # the latency of a key is the time from typing it until the frame showing its effect
+        frame_time = time.perf_counter()
+        for key_typed, typed_time in applied_keys:
+            telemetry.record('input', key=key_typed, latency_ms=(frame_time - typed_time) * 1000)
+        # save the game periodically on the simulation thread, between two updates of the game grid
+        # (the save takes less than a frame for the grid sizes of the settings)
+        if frame_time >= next_autosave_time:
+            simulation.call(lambda: save_game(save_file_path, grid))
+            next_autosave_time = frame_time + dimensions['AUTOSAVE_INTERVAL'] / 1000
+        clock.wait_for_next_frame()
+
+
+# Function for recording the finished game on the given game grid (after its simulation was stopped)
+def finish_game(grid, game_start_time):
+    delete_saved_game(save_file_path)
+    # the score is written by the writer thread of the leaderboard, so game over never stalls
+    leaderboard.record(grid.score, int(grid.get_number_matrix().max()), grid.grid_width,
+                       grid.grid_height, grid.game_speed, time.perf_counter() - game_start_time)
+    telemetry.record('game', score=grid.score, grid_width=grid.grid_width,
+                     grid_height=grid.grid_height, speed=grid.game_speed,
+                     duration=time.perf_counter() - game_start_time, dropped=telemetry.dropped)
+
+
+# Function called by the simulation thread after each lock for recording its metrics
+def record_lock(tetromino, lock_time, piece_time, score_delta, lock_stats):
+    telemetry.record('lock', piece=tetromino.type, lock_ms=lock_time * 1000, piece_time=piece_time,
+                     score_delta=score_delta, **lock_stats)
 
 
 # Function for creating random shaped tetrominoes
@@ -146,59 +256,66 @@ def display_settings_screen():
     sliderPositions = [dimensions['SLIDER_X'], dimensions['SLIDER_X'], dimensions['SLIDER_X']]
     gridSizeValues = [18, 21]  # Default grid size values
     game_speed = 250  # Default speed value
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    img_file = current_dir + dimensions['CONTROLS_IMAGE_PATH']
+    image_to_display = picture.load(img_file)
 
+    # the screen is redrawn only after the user clicked, otherwise it waits for input without using the CPU
+    redraw = True
     while True:
-        stddraw.clear(colors['BACKGROUND'])
-        # Draw slider bars for width, height, and speed
-        stddraw.setPenColor(colors['BLACK'])
-        stddraw.filledRectangle(dimensions['SLIDER_X'] - dimensions['SLIDER_BAR_WIDTH'] / 2,
-                                dimensions['SLIDER_BAR_Y_WIDTH'],
-                                dimensions['SLIDER_BAR_WIDTH'], dimensions['SLIDER_BAR_HEIGHT'])
-        stddraw.filledRectangle(dimensions['SLIDER_X'] - dimensions['SLIDER_BAR_WIDTH'] / 2,
-                                dimensions['SLIDER_BAR_Y_HEIGHT'],
-                                dimensions['SLIDER_BAR_WIDTH'], dimensions['SLIDER_BAR_HEIGHT'])
-        stddraw.filledRectangle(dimensions['SLIDER_X'] - dimensions['SLIDER_BAR_WIDTH'] / 2,
-                                dimensions['SLIDER_BAR_Y_SPEED'],
-                                dimensions['SLIDER_BAR_WIDTH'], dimensions['SLIDER_BAR_HEIGHT'])
-
-        # Show picture
-        current_dir = os.path.dirname(os.path.realpath(__file__))
-        img_file = current_dir + dimensions['CONTROLS_IMAGE_PATH']
-        img_center_x, img_center_y = 250, 225
-        image_to_display = Picture(img_file)
-        stddraw.picture(image_to_display, img_center_x, img_center_y)
-
-        # Draw slider knobs
-        stddraw.setPenColor(colors['WHITE'])
-        stddraw.filledCircle(sliderPositions[0], dimensions['SLIDER_BAR_Y_WIDTH'] + 5, dimensions['SLIDER_RADIUS'])
-        stddraw.filledCircle(sliderPositions[1], dimensions['SLIDER_BAR_Y_HEIGHT'] + 5, dimensions['SLIDER_RADIUS'])
-        stddraw.filledCircle(sliderPositions[2], dimensions['SLIDER_BAR_Y_SPEED'] + 5, dimensions['SLIDER_RADIUS'])
-
-        # Draw slider values
-        stddraw.setPenColor(colors['WHITE'])
-        stddraw.text(sliderPositions[0], dimensions['SLIDER_Y_WIDTH'] + 20, str(int(gridSizeValues[0])))
-        stddraw.text(sliderPositions[1], dimensions['SLIDER_Y_HEIGHT'] + 20, str(int(gridSizeValues[1])))
-        stddraw.text(sliderPositions[2], dimensions['SLIDER_Y_SPEED'], f" {game_speed}")
-
-        # Labels for sliders
-        stddraw.setFontSize(20)
-        stddraw.setFontFamily("Arial")
-        stddraw.boldText(65, dimensions['SLIDER_Y_WIDTH'], "Width")
-        stddraw.boldText(65, dimensions['SLIDER_Y_HEIGHT'], "Height")
-        stddraw.boldText(65, dimensions['SLIDER_Y_SPEED'] - 18, "Game Speed (ms)")
-
-        # Draw continue button
-        stddraw.setPenColor(colors['BUTTON'])
-        stddraw.filledRectangle(dimensions['CONTINUE_BUTTON_CENTER'][0] - dimensions['CONTINUE_BUTTON_WIDTH'] / 2,
-                                dimensions['CONTINUE_BUTTON_CENTER'][1] - dimensions['CONTINUE_BUTTON_HEIGHT'] - 5 / 2,
-                                dimensions['CONTINUE_BUTTON_WIDTH'], dimensions['CONTINUE_BUTTON_HEIGHT'])
-        stddraw.setPenColor(colors['TEXT'])
-        stddraw.boldText(dimensions['CONTINUE_BUTTON_CENTER'][0], dimensions['CONTINUE_BUTTON_CENTER'][1] - 25,
-                         texts['START_GAME'])
-
-        stddraw.show(10)
+        if redraw:
+            stddraw.clear(colors['BACKGROUND'])
+            # Draw slider bars for width, height, and speed
+            stddraw.setPenColor(colors['BLACK'])
+            stddraw.filledRectangle(dimensions['SLIDER_X'] - dimensions['SLIDER_BAR_WIDTH'] / 2,
+                                    dimensions['SLIDER_BAR_Y_WIDTH'],
+                                    dimensions['SLIDER_BAR_WIDTH'], dimensions['SLIDER_BAR_HEIGHT'])
+            stddraw.filledRectangle(dimensions['SLIDER_X'] - dimensions['SLIDER_BAR_WIDTH'] / 2,
+                                    dimensions['SLIDER_BAR_Y_HEIGHT'],
+                                    dimensions['SLIDER_BAR_WIDTH'], dimensions['SLIDER_BAR_HEIGHT'])
+            stddraw.filledRectangle(dimensions['SLIDER_X'] - dimensions['SLIDER_BAR_WIDTH'] / 2,
+                                    dimensions['SLIDER_BAR_Y_SPEED'],
+                                    dimensions['SLIDER_BAR_WIDTH'], dimensions['SLIDER_BAR_HEIGHT'])
+
+            # Show picture
+            img_center_x, img_center_y = 250, 225
+            stddraw.picture(image_to_display, img_center_x, img_center_y)
+
+            # Draw slider knobs
+            stddraw.setPenColor(colors['WHITE'])
+            stddraw.filledCircle(sliderPositions[0], dimensions['SLIDER_BAR_Y_WIDTH'] + 5, dimensions['SLIDER_RADIUS'])
+            stddraw.filledCircle(sliderPositions[1], dimensions['SLIDER_BAR_Y_HEIGHT'] + 5, dimensions['SLIDER_RADIUS'])
+            stddraw.filledCircle(sliderPositions[2], dimensions['SLIDER_BAR_Y_SPEED'] + 5, dimensions['SLIDER_RADIUS'])
+
+            # Draw slider values
+            stddraw.setPenColor(colors['WHITE'])
+            stddraw.text(sliderPositions[0], dimensions['SLIDER_Y_WIDTH'] + 20, str(int(gridSizeValues[0])))
+            stddraw.text(sliderPositions[1], dimensions['SLIDER_Y_HEIGHT'] + 20, str(int(gridSizeValues[1])))
+            stddraw.text(sliderPositions[2], dimensions['SLIDER_Y_SPEED'], f" {game_speed}")
+
+            # Labels for sliders
+            stddraw.setFontSize(20)
+            stddraw.setFontFamily("Arial")
+            stddraw.boldText(65, dimensions['SLIDER_Y_WIDTH'], "Width")
+            stddraw.boldText(65, dimensions['SLIDER_Y_HEIGHT'], "Height")
+            stddraw.boldText(65, dimensions['SLIDER_Y_SPEED'] - 18, "Game Speed (ms)")
+
+            # Draw continue button
+            stddraw.setPenColor(colors['BUTTON'])
+            stddraw.filledRectangle(dimensions['CONTINUE_BUTTON_CENTER'][0] - dimensions['CONTINUE_BUTTON_WIDTH'] / 2,
+                                    dimensions['CONTINUE_BUTTON_CENTER'][1] - dimensions['CONTINUE_BUTTON_HEIGHT'] - 5 / 2,
+                                    dimensions['CONTINUE_BUTTON_WIDTH'], dimensions['CONTINUE_BUTTON_HEIGHT'])
+            stddraw.setPenColor(colors['TEXT'])
+            stddraw.boldText(dimensions['CONTINUE_BUTTON_CENTER'][0], dimensions['CONTINUE_BUTTON_CENTER'][1] - 25,
+                             texts['START_GAME'])
+
+            stddraw.show(0)
+            redraw = False
+
+        stddraw.waitForEvent(dimensions['MENU_WAIT_TIMEOUT'])
 
         if stddraw.mousePressed():
+            redraw = True
             mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
             # Check which slider is being interacted with
             # Take the mouse input and update the slider position and value
@@ -245,7 +362,7 @@ def display_game_over_screen(grid_h, grid_w, current_score):
     img_file = current_dir + dimensions['GAME_OVER_WIN_PATH'] if current_score >= 2048 else current_dir + dimensions[
         'GAME_OVER_LOSE_PATH']
     img_center_x, img_center_y = (grid_w - 1) / 2, grid_h - 6
-    image_to_display = Picture(img_file)
+    image_to_display = picture.load(img_file)
     button_w, button_h = grid_w - 6, 1.4
     button_blc_x, button_blc_y = img_center_x - button_w / 2, 1.5
     menu_button_y = button_blc_y + 2
@@ -271,8 +388,9 @@ def display_game_over_screen(grid_h, grid_w, current_score):
     stddraw.setPenColor(colors['TEXT'])
     stddraw.text(img_center_x, menu_button_y + 0.7, "Return to Main Menu")
 
+    stddraw.show(0)
     while True:
-        stddraw.show(50)
+        stddraw.waitForEvent(dimensions['MENU_WAIT_TIMEOUT'])
         if stddraw.mousePressed():
             mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
             if button_blc_x <= mouse_x <= button_blc_x + button_w:
@@ -289,7 +407,7 @@ def display_game_menu(grid_height, grid_width, max_score):
     current_dir = os.path.dirname(os.path.realpath(__file__))
     img_file = current_dir + dimensions['MENU_IMAGE_PATH']
     img_center_x, img_center_y = (grid_width - 0.75) / 2, grid_height - 3
-    image_to_display = Picture(img_file)
+    image_to_display = picture.load(img_file)
     stddraw.picture(image_to_display, img_center_x, img_center_y)
     button_w, button_h = grid_width - 1.5, 1.8
     button_blc_x, button_blc_y = img_center_x - button_w / 2, 1.5
@@ -311,8 +429,9 @@ def display_game_menu(grid_height, grid_width, max_score):
     for i, line in enumerate(instructions):
         stddraw.text(img_center_x, instructions_y_position - i, line)
 
+    stddraw.show(0)
     while True:
-        stddraw.show(50)
+        stddraw.waitForEvent(dimensions['MENU_WAIT_TIMEOUT'])
         if stddraw.mousePressed():
             mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
             if button_blc_x <= mouse_x <= button_blc_x + button_w and button_blc_y <= mouse_y <= button_blc_y + button_h:
@@ -327,12 +446,13 @@ def display_game_menu(grid_height, grid_width, max_score):
 # Function for displaying the pause screen when the game is paused by the user pressing the 'ESC' key
 # It displays the current score and a message to resume the game
 # The user can also return to the main menu by clicking on the button
+# Returns True when the game is resumed and False when the user returns to the main menu
 def display_pause_screen(current_score):
     current_dir = os.path.dirname(os.path.realpath(__file__))
     img_file = current_dir + dimensions['GAME_PAUSED_PATH']
     img_center_x, img_center_y = (dimensions['GRID_WIDTH'] + dimensions['INFO_WIDTH']) / 2, dimensions[
         'GRID_HEIGHT'] - 3
-    image_to_display = Picture(img_file)
+    image_to_display = picture.load(img_file)
     stddraw.picture(image_to_display, img_center_x, img_center_y)
     stddraw.setFontFamily("Arial")
     stddraw.setFontSize(40)
@@ -344,41 +464,27 @@ def display_pause_screen(current_score):
     stddraw.setFontSize(25)
     stddraw.text(img_center_x, 4, "Return to Main Menu")
 
+    stddraw.show(0)
     while True:
-        stddraw.show(50)
+        stddraw.waitForEvent(dimensions['MENU_WAIT_TIMEOUT'])
         if stddraw.hasNextKeyTyped():
             key_typed = stddraw.nextKeyTyped()
             if key_typed == "escape":
                 stddraw.clearKeysTyped()
-                break
+                return True
         if stddraw.mousePressed():
             mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
             if img_center_x - 6 <= mouse_x <= img_center_x + 6 and 3 <= mouse_y <= 5:
-                start()
-
-
-# function to read the maximum score from the file
-def read_max_score_from_file(file_path):
-    try:
-        with open(file_path, "r") as file:
-            max_score = int(file.read().strip())
-            return max_score
-    except FileNotFoundError:
-        return 0
-    except ValueError:
-        return 0
-
-
-# function to write the maximum score to the file
-def write_max_score_to_file(max_score, file_path):
-    with open(file_path, "w") as file:
-        file.write(str(max_score))
+                return False
 
 
 # start() function is specified as the entry point (main function) from which
 # the program starts execution
 if __name__ == '__main__':
     stddraw.setCanvasSize(dimensions['CANVAS_WIDTH'], dimensions['CANVAS_HEIGHT'])
+    game_dir = os.path.dirname(os.path.realpath(__file__))
+    # read all menu images in the background while the first menu is being drawn
+    picture.preload([game_dir + dimensions[key] for key in dimensions if key.endswith('_PATH')])
 
     start()
 # Main function where this program starts execution
@@ -0,0 +1,41 @@
+import time  # used for reading the high-resolution clock
+from collections import deque  # used as the queue of the animation events
+
+
+# Class used for playing back the visual effects of locking a tetromino (merges, flying tile
+# removals and row clears) without blocking the game loop
+# The game grid is updated at once, and a snapshot of the numbers on the grid after each step is
+# added to the timeline as an animation event. The render loop then shows each snapshot for
+# step_duration milliseconds while the game keeps accepting input
+class AnimationTimeline:
+    # Constructor for creating an empty timeline with the given duration (in ms) of each event
+    def __init__(self, step_duration):
+        self.step_duration = step_duration / 1000
+        # queue of the (kind, number_matrix) events that are not played yet
+        self.events = deque()
+        # the time when the event at the front of the queue ends (None if it has not started)
+        self.event_end_time = None
+
+    # Method used for adding an event of the given kind ('merge', 'flying' or 'clear') that shows
+    # the given snapshot of the number matrix
+    def add(self, kind, number_matrix):
+        self.events.append((kind, number_matrix))
+
+    # Method used for dropping the events that have not been played yet
+    def clear(self):
+        self.events.clear()
+        self.event_end_time = None
+
+    # Method that returns the number matrix to show at the current time, or None when all
+    # the events have been played and the game grid itself should be shown
+    def current_frame(self):
+        now = time.perf_counter()
+        while self.events:
+            if self.event_end_time is None:
+                self.event_end_time = now + self.step_duration
+            if now < self.event_end_time:
+                return self.events[0][1]
+            # the event at the front is over, the next one starts when it ended
+            self.events.popleft()
+            self.event_end_time = self.event_end_time + self.step_duration if self.events else None
+        return None
@@ -0,0 +1,72 @@
+import sys  # used for reading the command line arguments
+import time  # used for measuring the time of the benchmark
+from collections import namedtuple  # used for the features of the boards
+import numpy as np  # used for computing the features of all the boards at once
+
+# Features of a board (or of each board of a batch) used by the bots, the difficulty tuning and the analytics
+# For a batch of N boards of size h x w each feature has a leading N axis, for a single board it has none
+#   column_heights: (w,) 1 + the row of the topmost tile of each column (0 for an empty column)
+#   holes:          the number of empty cells below the topmost tile of their column
+#   bumpiness:      the sum of the height differences of the neighboring columns
+#   wells:          the sum of the depths of the columns that are lower than both of their neighbors
+#                   (the walls of the game grid are as high as the game grid)
+#   max_tile:       the largest number on the board (0 for an empty board)
+#   merge_pairs:    the number of vertically adjacent tiles with the same number (the merge potential)
+#   row_fill:       (h,) the fraction of the cells of each row that have a tile
+BoardFeatures = namedtuple('BoardFeatures', ['column_heights', 'holes', 'bumpiness', 'wells', 'max_tile',
+                                             'merge_pairs', 'row_fill'])
+
+
+# Function that returns the features (BoardFeatures) of the given board or batch of boards
+# boards is an integer array of the tile numbers (0 for the empty cells, row 0 is the bottom row) of shape
+# (h, w) for a single board, e.g. GameGrid.get_number_matrix(), or (N, h, w) for a batch of boards
+def board_features(boards):
+    boards = np.asarray(boards)
+    single_board = boards.ndim == 2
+    if single_board:
+        boards = boards[np.newaxis]
+    grid_h, grid_w = boards.shape[1:]
+    occupied = boards != 0
+    # the topmost tile of each column is the first occupied cell from the top row down (argmax is 0 for
+    # an empty column too, so the cell it points at tells whether the column has tiles)
+    from_top = occupied[:, ::-1, :]
+    topmost = np.argmax(from_top, axis=1)
+    has_tiles = np.take_along_axis(from_top, topmost[:, np.newaxis, :], axis=1)[:, 0, :]
+    column_heights = np.where(has_tiles, grid_h - topmost, 0)
+    # the number of tiles in each row (einsum sums the rows much faster than sum on the last axis)
+    row_counts = np.einsum('nhw->nh', occupied.view(np.uint8), dtype=np.int32)
+    # every cell below the height of its column that is not occupied is a hole
+    holes = column_heights.sum(axis=1) - row_counts.sum(axis=1)
+    bumpiness = np.abs(np.diff(column_heights, axis=1)).sum(axis=1)
+    walls = np.pad(column_heights, ((0, 0), (1, 1)), constant_values=grid_h)
+    wells = np.maximum(np.minimum(walls[:, :-2], walls[:, 2:]) - column_heights, 0).sum(axis=1)
+    max_tile = boards.reshape(len(boards), -1).max(axis=1)
+    equal_pairs = (boards[:, 1:, :] == boards[:, :-1, :]) & occupied[:, 1:, :]
+    merge_pairs = equal_pairs.reshape(len(boards), -1).sum(axis=1, dtype=np.int32)
+    row_fill = row_counts / grid_w
+    features = BoardFeatures(column_heights, holes, bumpiness, wells, max_tile, merge_pairs, row_fill)
+    if single_board:
+        features = BoardFeatures(*(feature[0] for feature in features))
+    return features
+
+
+# Function for measuring the time of computing the features of the given number of random boards
+# Returns the time in milliseconds
+def benchmark(n_boards, grid_h, grid_w, seed=0):
+    rng = np.random.default_rng(seed)
+    # random boards with tiles up to a random height in each column
+    heights = rng.integers(0, grid_h + 1, size=(n_boards, 1, grid_w))
+    numbers = 2 ** rng.integers(1, 8, size=(n_boards, grid_h, grid_w))
+    empty = rng.random((n_boards, grid_h, grid_w)) < 0.1
+    boards = np.where((np.arange(grid_h)[:, np.newaxis] < heights) & ~empty, numbers, 0).astype(np.int32)
+    start_time = time.perf_counter()
+    board_features(boards)
+    return (time.perf_counter() - start_time) * 1000
+
+
+# Usage: python board_features.py [NUMBER_OF_BOARDS] [HEIGHT] [WIDTH]
+if __name__ == '__main__':
+    n_boards = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    grid_h = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    grid_w = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    print(f"features of {n_boards} {grid_h} x {grid_w} boards: {benchmark(n_boards, grid_h, grid_w):.1f} ms")
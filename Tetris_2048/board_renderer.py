@@ -0,0 +1,94 @@
+import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
+from tile import Tile  # used for the tile box color and the font of the tile numbers
+from tile_color import tile_colors  # used for the palette of the tile colors
+import numpy as np  # used for rasterizing the boards through the palette lookup table
+
+
+# Class used for drawing the tiles on a game grid with precomputed pixel geometry
+# The pixel rectangle of every cell and the converted colors and number images of every
+# palette entry are computed once, so drawing a tile is only integer fills and a blit
+# For large grids the whole board is rasterized instead: the numbers are mapped through a
+# palette lookup table into a tiny image with one pixel per cell, which is scaled in one blit
+class BoardRenderer:
+    # Renderers shared among all game grids, keyed by the grid size and the pixel rectangle of the grid
+    renderers = {}
+    # grids with more cells than this are rasterized instead of drawn tile by tile
+    raster_min_cells = 1024
+    # the numbers are drawn on the rasterized boards only when the cells are at least this many pixels wide
+    label_min_size = 20
+
+    # Method that returns the renderer for a grid with the given size drawn at the current
+    # stddraw scale, creating it on the first call
+    @staticmethod
+    def get(grid_h, grid_w):
+        key = (grid_h, grid_w, stddraw.pixelRect(-0.5, -0.5, grid_w, grid_h))
+        if key not in BoardRenderer.renderers:
+            BoardRenderer.renderers[key] = BoardRenderer(grid_h, grid_w)
+        return BoardRenderer.renderers[key]
+
+    # Constructor for creating a renderer for a grid with the given size at the current stddraw scale
+    def __init__(self, grid_h, grid_w):
+        self.grid_height = grid_h
+        self.grid_width = grid_w
+        # pixel rectangle of the whole grid and the size of the cells in pixels
+        self.grid_rect = stddraw.pixelRect(-0.5, -0.5, grid_w, grid_h)
+        self.cell_size = (self.grid_rect[2] / grid_w, self.grid_rect[3] / grid_h)
+        self.rasterize = grid_h * grid_w > BoardRenderer.raster_min_cells
+        # integer pixel rectangle and center of each cell (cell_rects[row][col]), which are
+        # not needed when the grid is rasterized
+        self.cell_rects, self.cell_centers = None, None
+        if not self.rasterize:
+            self.cell_rects = [[stddraw.pixelRect(col - 0.5, row - 0.5, 1, 1) for col in range(grid_w)]
+                               for row in range(grid_h)]
+            self.cell_centers = [[(x + w // 2, y + h // 2) for (x, y, w, h) in rects]
+                                 for rects in self.cell_rects]
+        # the tile boxes are drawn as in Tile.draw
+        self.box_color = stddraw.mapColor(Tile.box_color)
+        self.box_width = stddraw.penWidth(Tile.boundary_thickness)
+        # converted background color and number image for each number in the palette
+        self.palette = {}
+        for number, colors in tile_colors.items():
+            self.palette[number] = (stddraw.mapColor(colors['background_color']),
+                                    stddraw.renderText(str(number), colors['foreground_color'],
+                                                       Tile.font_family, Tile.font_size))
+        # palette lookup table indexed by log2 of the numbers (index 0 is for the empty cells)
+        self.palette_lut = np.zeros((max(tile_colors).bit_length(), 3), dtype=np.uint8)
+        self.number_images = [None] * len(self.palette_lut)
+        for number, colors in tile_colors.items():
+            color = colors['background_color']
+            index = number.bit_length() - 1
+            self.palette_lut[index] = (color.getRed(), color.getGreen(), color.getBlue())
+            self.number_images[index] = self.palette[number][1]
+
+    # Method for drawing the tiles with the given numbers on the cells with the given rows and columns
+    # The boxes are filled one by one and all the number images are drawn with a single blit call
+    def draw_tiles(self, numbers, rows, cols):
+        number_images, centers = [], []
+        for number, row, col in zip(numbers, rows, cols):
+            background_color, number_image = self.palette[number]
+            rect = self.cell_rects[row][col]
+            stddraw.fillPixelRect(rect, background_color)
+            stddraw.fillPixelRect(rect, self.box_color, self.box_width)
+            number_images.append(number_image)
+            centers.append(self.cell_centers[row][col])
+        stddraw.blitsPixels(number_images, centers)
+
+    # Method for drawing a whole board given as an integer matrix of tile numbers (0 for the
+    # empty cells, row 0 is the bottom row) by rasterizing it: the matrix is mapped through the
+    # palette lookup table into an image with one pixel per cell that is scaled onto the grid in
+    # a single blit, so the cost hardly depends on how full the board is. The numbers are drawn
+    # only when the cells are big enough to read them
+    def draw_number_matrix(self, number_matrix, empty_cell_color):
+        number_matrix = np.asarray(number_matrix)
+        self.palette_lut[0] = (empty_cell_color.getRed(), empty_cell_color.getGreen(),
+                               empty_cell_color.getBlue())
+        indexes = np.log2(np.maximum(number_matrix, 1)).astype(np.intp)
+        # flip the rows since row 0 is at the bottom of the grid but at the top of the image
+        stddraw.pixelArray(self.palette_lut[indexes[::-1]], self.grid_rect)
+        if min(self.cell_size) < BoardRenderer.label_min_size:
+            return
+        rows, cols = np.nonzero(number_matrix)
+        xs = self.grid_rect[0] + (cols + 0.5) * self.cell_size[0]
+        ys = self.grid_rect[1] + (self.grid_height - rows - 0.5) * self.cell_size[1]
+        stddraw.blitsPixels([self.number_images[index] for index in indexes[rows, cols]],
+                            np.stack([xs, ys], axis=-1).astype(int).tolist())
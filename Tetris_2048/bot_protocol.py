@@ -0,0 +1,189 @@
+import sys  # used for reading the command line arguments and for the standard streams of the example bot
+import time  # used for measuring the response latency of the bots
+import random  # used by the example bot for choosing its moves
+import asyncio  # used for talking to the bots without blocking the games
+import functools  # used for binding the grid size of each game to its tetromino factory
+from game_grid import GameGrid  # the class for modeling the game grid
+from simulation import Simulation  # used for applying the keys of the bots and locking the tetrominoes
+from game_server import create_tetromino  # used for creating random tetrominoes for a given grid size
+
+# Protocol: a bot is a separate process (written in any language) that talks over its standard input
+# and output or over a local TCP socket, one line per message
+# The harness sends a state line whenever a game needs a decision:
+#   ID HEIGHT WIDTH SCORE PIECE_TYPE PIECE_X PIECE_Y PIECE_TILES NEXT_TYPE BOARD
+# where PIECE_X and PIECE_Y are the position of the bottom left cell of the n x n tile matrix of the
+# current piece, PIECE_TILES are its n * n numbers (0 for the empty cells, top row first) separated by
+# commas, and BOARD are the HEIGHT * WIDTH numbers on the grid (bottom row first) separated by commas
+# The bot replies with the id of the state and the keys to apply, separated by commas (left, right,
+# down, a, d), after which the piece is hard dropped and locked:
+#   ID KEY,KEY,...
+# The requests are pipelined: the states of all the games played against a bot are sent without
+# waiting for the replies, so the bot can answer them in any order, e.g. while it is still thinking
+# about another game
+
+
+# Class for the connection to a bot, which matches the replies to the pipelined requests by their ids
+# and measures the response latency of each request
+class BotConnection:
+    # Constructor for creating the connection with the given stream reader and writer
+    def __init__(self, reader, writer, process=None):
+        self.reader, self.writer = reader, writer
+        self.process = process
+        # the (future, send time) pairs of the requests that are not answered yet, keyed by their ids
+        self.pending = {}
+        self.next_id = 1
+        # the response latencies (in seconds) of the answered requests
+        self.latencies = []
+        self.read_task = asyncio.get_running_loop().create_task(self.read_replies())
+
+    # Function for starting a bot process with the given command line, talking over its standard streams
+    @staticmethod
+    async def start_process(command):
+        process = await asyncio.create_subprocess_exec(*command, stdin=asyncio.subprocess.PIPE,
+                                                       stdout=asyncio.subprocess.PIPE)
+        return BotConnection(process.stdout, process.stdin, process)
+
+    # Function for connecting to a bot listening on the given host and port
+    @staticmethod
+    async def connect(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return BotConnection(reader, writer)
+
+    # Method for sending the given state line (without its id) and waiting for the keys of the reply
+    async def request(self, state):
+        request_id = self.next_id
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = (future, time.perf_counter())
+        self.writer.write(f"{request_id} {state}\n".encode())
+        await self.writer.drain()
+        return await future
+
+    # Method run as a task for reading the replies of the bot and answering the matching requests
+    async def read_replies(self):
+        try:
+            async for line in self.reader:
+                fields = line.decode().split()
+                if not fields or not fields[0].isdigit():
+                    continue
+                request = self.pending.pop(int(fields[0]), None)
+                if request is None:
+                    continue
+                future, send_time = request
+                self.latencies.append(time.perf_counter() - send_time)
+                # the request may have been given up after a timeout
+                if not future.done():
+                    future.set_result(fields[1].split(",") if len(fields) > 1 else [])
+        finally:
+            for future, _ in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("the bot closed the connection"))
+            self.pending.clear()
+
+    # Method for closing the connection (and stopping the bot process)
+    async def close(self):
+        self.writer.close()
+        if self.process is not None:
+            try:
+                await asyncio.wait_for(self.process.wait(), 1)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        self.read_task.cancel()
+
+
+# Function that returns the state line (without its id) of the game on the given game grid
+def encode_state(grid):
+    tetromino = grid.current_tetromino
+    piece_tiles = ",".join(str(0 if tile is None else tile.number) for row in tetromino.tile_matrix for tile in row)
+    board = ",".join(map(str, grid.get_number_matrix().ravel().tolist()))
+    position = tetromino.bottom_left_cell
+    return (f"{grid.grid_height} {grid.grid_width} {grid.score} {tetromino.type} {position.x} {position.y} "
+            f"{piece_tiles} {grid.next_tetromino.type} {board}")
+
+
+# Function for playing a game of the given grid size against the given bot until the game is over, the
+# given number of pieces was played or the bot did not reply in timeout seconds
+# The first state of the game is given startup_timeout seconds instead (when given), as a bot process that
+# was just started only replies to it after its startup
+# Returns the score, the number of played pieces and how the game ended ('over', 'max_pieces', 'timeout'
+# or 'disconnected')
+async def play_game(bot, grid_h, grid_w, max_pieces=1000, timeout=1.0, startup_timeout=None):
+    grid = GameGrid(grid_h, grid_w, 0, 0)
+    new_tetromino = functools.partial(create_tetromino, grid_h, grid_w)
+    grid.current_tetromino, grid.next_tetromino = new_tetromino(), new_tetromino()
+    # the keys are applied and the pieces are locked with the methods of the simulation, without its thread
+    simulation = Simulation(grid, None, new_tetromino)
+    pieces = 0
+    while not grid.game_over and pieces < max_pieces:
+        # a bot that does not reply in time (or at all) loses the game
+        try:
+            reply_timeout = startup_timeout if pieces == 0 and startup_timeout is not None else timeout
+            keys = await asyncio.wait_for(bot.request(encode_state(grid)), reply_timeout)
+        except asyncio.TimeoutError:
+            return grid.score, pieces, 'timeout'
+        except ConnectionError:
+            return grid.score, pieces, 'disconnected'
+        for key in keys:
+            if key != "space":
+                simulation.apply_key(key)
+        simulation.apply_key("space")
+        simulation.gravity_step()
+        pieces += 1
+    return grid.score, pieces, 'over' if grid.game_over else 'max_pieces'
+
+
+# Function that returns the (mean, median, 99th percentile, max) of the given latencies in milliseconds
+def latency_summary(latencies):
+    if not latencies:
+        return 0.0, 0.0, 0.0, 0.0
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    return sum(ordered) / len(ordered) * 1000, p50 * 1000, p99 * 1000, ordered[-1] * 1000
+
+
+# Function for playing the given number of games at once against the bot, which pipelines the requests
+# Returns the list of (score, pieces, status) results of the games
+async def run_harness(bot, n_games, grid_h=18, grid_w=12, max_pieces=1000, timeout=1.0):
+    return await asyncio.gather(*(play_game(bot, grid_h, grid_w, max_pieces, timeout) for _ in range(n_games)))
+
+
+# Function for running the example bot, which plays random moves over its standard input and output
+def example_bot():
+    for line in sys.stdin:
+        fields = line.split()
+        width, piece_x = int(fields[2]), int(fields[5])
+        keys = [random.choice(["a", "d"])] * random.randint(0, 3)
+        shift = random.randint(-piece_x, width - 1 - piece_x)
+        keys += ["left" if shift < 0 else "right"] * abs(shift)
+        sys.stdout.write(f"{fields[0]} {','.join(keys)}\n")
+        sys.stdout.flush()
+
+
+# Function for running the harness with the bot given on the command line and reporting the results
+async def main(n_games, bot_address):
+    if bot_address[0].startswith("tcp:"):
+        _, host, port = bot_address[0].split(":")
+        bot = await BotConnection.connect(host, int(port))
+    else:
+        bot = await BotConnection.start_process(bot_address)
+    results = await run_harness(bot, n_games)
+    await bot.close()
+    scores = [score for score, _, _ in results]
+    print(f"games: {len(results)}, mean score: {sum(scores) / len(scores):.1f}, max score: {max(scores)}, "
+          f"pieces: {sum(pieces for _, pieces, _ in results)}")
+    print("response latency (ms): mean %.2f, p50 %.2f, p99 %.2f, max %.2f" % latency_summary(bot.latencies))
+
+
+# Usage: python bot_protocol.py GAMES BOT_COMMAND [ARGS ...]   (a bot talking over its standard streams)
+#        python bot_protocol.py GAMES tcp:HOST:PORT             (a bot listening on a local socket)
+#        python bot_protocol.py --example-bot                   (the example bot, e.g. as the BOT_COMMAND)
+if __name__ == '__main__':
+    if len(sys.argv) == 2 and sys.argv[1] == "--example-bot":
+        example_bot()
+    elif len(sys.argv) >= 3:
+        asyncio.run(main(int(sys.argv[1]), sys.argv[2:]))
+    else:
+        print("Usage: python bot_protocol.py GAMES BOT_COMMAND [ARGS ...] | GAMES tcp:HOST:PORT | --example-bot")
+        sys.exit(1)
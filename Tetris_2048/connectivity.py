@@ -0,0 +1,41 @@
+import heapq  # used for searching the lowest cells first
+
+
+# Function that returns the set of (row, col) cells of the tiles that are not connected to the ground (the
+# bottom row) among the components of the tiles on the given cells, where is_occupied(row, col) tells
+# whether a cell has a tile (False outside the grid)
+# After a change of the game grid only the tiles on and next to the changed cells can have been
+# disconnected, so searching their components is enough instead of searching the whole grid. Each search
+# visits the lowest cells first and stops as soon as it reaches the ground, so it usually visits a few
+# cells for a grounded tile, and only the tiles that are removed for a flying one
+def find_flying_tiles(is_occupied, cells):
+    grounded, flying = set(), set()
+    for cell in cells:
+        if cell in grounded or cell in flying or not is_occupied(*cell):
+            continue
+        visited, heap = {cell}, [cell]
+        reached_ground = False
+        while heap:
+            row, col = heapq.heappop(heap)
+            if row == 0 or (row, col) in grounded:
+                reached_ground = True
+                break
+            for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if neighbor not in visited and is_occupied(*neighbor):
+                    visited.add(neighbor)
+                    heapq.heappush(heap, neighbor)
+        # the visited tiles are connected to the cell, so they are all grounded or all flying
+        if reached_ground:
+            grounded.update(visited)
+        else:
+            flying.update(visited)
+    return flying
+
+
+# Function that returns the given cells and their neighbors, which are the cells whose components have
+# to be searched after the tiles on the given cells changed
+def cells_around(cells):
+    around = set()
+    for row, col in cells:
+        around.update(((row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)))
+    return around
@@ -0,0 +1,47 @@
+import time  # used for reading the high-resolution clock and sleeping between frames
+
+
+# Class used for scheduling the game loop on a high-resolution clock
+# The gravity steps are scheduled with the game speed interval and the rendered frames with the
+# target frame rate, so the frame rate (and the input latency) does not depend on the game speed
+class GameClock:
+    # Constructor for creating a clock with the given gravity interval (in milliseconds) and frame rate
+    def __init__(self, gravity_interval, fps):
+        self.gravity_interval = gravity_interval / 1000
+        self.frame_interval = 1 / fps
+        self.next_gravity_time = None
+        self.next_frame_time = None
+        self.reset()
+
+    # Method used for restarting the schedule from now, e.g. after the game was paused
+    # so that the time spent on the pause screen does not cause catch-up gravity steps
+    def reset(self):
+        now = time.perf_counter()
+        self.next_gravity_time = now + self.gravity_interval
+        self.next_frame_time = now + self.frame_interval
+
+    # Method that returns True when a gravity step is due and schedules the next one
+    # When the loop fell behind by more than one interval, the schedule restarts from now
+    # instead of running several gravity steps in a row
+    def gravity_tick(self):
+        now = time.perf_counter()
+        if now < self.next_gravity_time:
+            return False
+        self.next_gravity_time += self.gravity_interval
+        if self.next_gravity_time <= now:
+            self.next_gravity_time = now + self.gravity_interval
+        return True
+
+    # Method that returns the time (in seconds) until the next gravity step is due
+    def time_until_gravity(self):
+        return max(0.0, self.next_gravity_time - time.perf_counter())
+
+    # Method used for sleeping until the next frame is due
+    def wait_for_next_frame(self):
+        delay = self.next_frame_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+            self.next_frame_time += self.frame_interval
+        else:
+            # the frame took longer than the frame interval, start the next one right away
+            self.next_frame_time = time.perf_counter() + self.frame_interval
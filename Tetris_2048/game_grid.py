@@ -1,27 +1,61 @@
 import sys
+from collections import namedtuple  # used for the immutable snapshots of the game grid
 import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
-from tile import Tile
 from lib.color import Color  # used for coloring the game grid
-from point import Point  # used for tile positions
+from animation import AnimationTimeline  # used for playing back the steps of locking a tetromino
+from board_renderer import BoardRenderer  # used for drawing the tiles with precomputed pixel geometry
+from grid_rules import GridRules  # the rules of locking a tetromino shared with the sparse game grid
 import numpy as np  # fundamental Python module for scientific computing
 
+# Immutable snapshot of a game grid, drawn by the render loop while the game grid is updated by the simulation
+# board is a read-only copy of the number matrix, piece holds the (row, col, number) tuples of the visible tiles
+# of the current tetromino, and lock_frames holds the (kind, number_matrix) animation steps of the lock counted
+# by lock_count
+GameSnapshot = namedtuple('GameSnapshot', ['board', 'piece', 'next_type', 'score', 'max_score', 'lock_count',
+                                           'lock_frames', 'game_over'])
+
 
 # Class used for modelling the game grid
-class GameGrid:
+class GameGrid(GridRules):
+    # Static drawing layers shared among all GameGrid objects, keyed by the grid
+    # size and the canvas size they were composed for
+    static_layers = {}
+    # (dx, dy) offsets of the blocks of each tetromino type in the next tetromino preview
+    preview_offsets = {
+        'I': [(0, 0), (0, -1), (0, -2), (0, -3)],
+        'O': [(0, 0), (0, -1), (1, 0), (1, -1)],
+        'S': [(0, 0), (1, 0), (-1, -1), (0, -1)],
+        'Z': [(0, 0), (-1, 0), (0, -1), (1, -1)],
+        'L': [(0, 0), (0, -1), (0, -2), (1, -2)],
+        'J': [(0, 0), (0, -1), (0, -2), (-1, -2)],
+        'T': [(-1, -1), (0, -1), (1, -1), (0, 0)],
+    }
+
     # Constructor for creating the game grid based on the given arguments
-    def __init__(self, grid_h, grid_w, info_w, game_speed):
+    # The animation_speed is the duration (in ms) of each step shown after locking a tetromino
+    def __init__(self, grid_h, grid_w, info_w, game_speed, animation_speed=80):
         # set the dimensions of the game grid as the given arguments
-        self.grid_height = grid_h
-        self.grid_width = grid_w
+        super().__init__(grid_h, grid_w)
         self.info_width = info_w
         self.game_speed = game_speed
+        # timeline of the merge, flying tile removal and row clear steps that are played back
+        # by the render loop while the game goes on
+        self.animations = AnimationTimeline(animation_speed)
         # create a tile matrix to store the tiles landed onto the game grid
+        # The rows of the game grid are stored in the rows of the tile matrix given by row_slots (row_slots[0]
+        # for the bottom row), so clearing a row moves the indexes of the rows above it instead of their tiles
         self.tile_matrix = np.full((grid_h, grid_w), None)
-        # create the tetromino that is currently being moved on the game grid and the next tetromino to be moved
-        self.current_tetromino = None
-        self.next_tetromino = None
-        # the game_over flag shows whether the game is over or not
-        self.game_over = False
+        self.row_slots = list(range(grid_h))
+        # the number of tiles in each row and the rows that are full, updated whenever a tile is set or
+        # cleared so that the full rows are known without checking every row
+        self.row_counts = np.zeros(grid_h, dtype=np.int64)
+        self.full_rows = set()
+        # integer matrix with the numbers on the landed tiles (0 for the empty cells)
+        # that is kept in sync with the tile matrix whenever a tile is set or cleared
+        self.number_matrix = np.zeros((grid_h, grid_w), dtype=np.int32)
+        # read-only view of the number matrix given to the observers of the game grid
+        self.number_matrix_view = self.number_matrix.view()
+        self.number_matrix_view.flags.writeable = False
         # set the color used for the empty grid cells
         self.empty_cell_color = Color(84, 73, 78)
         # set the colors used for the grid lines and the grid boundaries
@@ -30,47 +64,101 @@ class GameGrid:
         # thickness values used for the grid lines and the boundaries
         self.line_thickness = 0.005
         self.box_thickness = 1.5 * self.line_thickness
-        # set the score to 0 at the beginning of the game
-        self.score = 0
+        # the best score is set by the game
         self.max_score = None
+        # the board and the lock animation steps of the last snapshot, which are copied again only
+        # when a tetromino was locked after that snapshot
+        self.snapshot_lock_count = None
+        self.board_snapshot, self.lock_frames = None, ()
+        # position and size of the exit button at the bottom of the info panel
+        self.exit_button_top = 0.5  # Distance from bottom of the info panel
+        self.exit_button_height = 1
 
     # Method used for displaying the game grid
     def display(self):
-        # clear the background to empty_cell_color
-
-        stddraw.clear(self.empty_cell_color)
-        # draw the game grid
-        self.draw_grid()
-        # draw the current/active tetromino if it is not None (the case when the
-        # game grid is updated)
+        self.draw_snapshot(self.snapshot(), self.animations)
+
+    # Method that returns an immutable snapshot (GameSnapshot) of the current state of the game grid
+    def snapshot(self):
+        if self.snapshot_lock_count != self.lock_count:
+            self.board_snapshot = self.number_matrix.copy()
+            self.board_snapshot.flags.writeable = False
+            self.lock_frames = tuple(self.animations.events)
+            self.snapshot_lock_count = self.lock_count
+        piece = ()
         if self.current_tetromino is not None:
-            self.current_tetromino.draw()
-        # draw a box around the game grid
-
-        self.draw_boundaries()
-        self.draw_info_panel()
-
-        # show the resulting drawing with a pause duration = 250 ms
-        stddraw.show(self.game_speed)
+            piece = tuple(self.current_tetromino.get_visible_tiles())
+        next_type = None if self.next_tetromino is None else self.next_tetromino.type
+        return GameSnapshot(self.board_snapshot, piece, next_type, self.score, self.max_score, self.lock_count,
+                            self.lock_frames, self.game_over)
+
+    # Method used for drawing the given snapshot of the game grid, with the step of the lock animation
+    # that is being played on the given animation timeline
+    # Only the sizes and the colors of the game grid are read, which never change, so a snapshot can be
+    # drawn while the game grid is updated on another thread
+    def draw_snapshot(self, snapshot, animations):
+        # copy the static layers (the empty grid cells, the grid lines, the boundaries and the
+        # info panel) onto the canvas instead of clearing and redrawing it
+        background_layer, overlay_layer = self.get_static_layers()
+        stddraw.layer(background_layer)
+        # draw the tiles locked on the game grid, or the step of the lock animation that is being played
+        number_matrix = animations.current_frame()
+        self.draw_grid(snapshot.board if number_matrix is None else number_matrix)
+        # draw the inner grid lines and the boundaries over the locked tiles
+        stddraw.layer(overlay_layer)
+        # draw the current/active tetromino if there is one (there is none while the game grid is updated)
+        if snapshot.piece:
+            rows, cols, numbers = zip(*snapshot.piece)
+            BoardRenderer.get(self.grid_height, self.grid_width).draw_tiles(numbers, rows, cols)
+        # draw the parts of the info panel that change during the game
+        self.draw_info_panel(snapshot.score, snapshot.max_score, snapshot.next_type)
+
+        # show the resulting drawing without waiting
+        stddraw.show(0)
+
+    # Method that returns the static (background, overlay) layers of the game
+    # grid. The layers only depend on the grid size and the canvas size, so
+    # they are composed once and shared by every game grid with the same sizes
+    def get_static_layers(self):
+        key = (self.grid_height, self.grid_width, self.info_width, stddraw.canvasSize())
+        if key not in GameGrid.static_layers:
+            # the background layer holds the empty cells and the info panel chrome
+            stddraw.beginLayer()
+            stddraw.clear(self.empty_cell_color)
+            self.draw_info_panel_chrome()
+            background_layer = stddraw.endLayer()
+            # the overlay layer holds the grid lines and the boundaries that
+            # are drawn on top of the locked tiles
+            stddraw.beginLayer(transparent=True)
+            self.draw_grid_lines()
+            self.draw_boundaries()
+            overlay_layer = stddraw.endLayer()
+            GameGrid.static_layers[key] = (background_layer, overlay_layer)
+        return GameGrid.static_layers[key]
+
+    # Method for drawing the cells of the game grid with the numbers in the given number matrix
+    def draw_grid(self, number_matrix):
+        # the renderer with the precomputed pixel rectangles of the cells
+        renderer = BoardRenderer.get(self.grid_height, self.grid_width)
+        # large grids are rasterized from the number matrix in a single blit
+        if renderer.rasterize:
+            renderer.draw_number_matrix(number_matrix, self.empty_cell_color)
+            return
+        # otherwise the tiles on the occupied grid cells are drawn together
+        rows, cols = np.nonzero(number_matrix)
+        renderer.draw_tiles(number_matrix[rows, cols].tolist(), rows.tolist(), cols.tolist())
 
-    # Method for drawing the cells and the lines of the game grid
-    def draw_grid(self):
-        # for each cell of the game grid
-        for row in range(self.grid_height):
-            for col in range(self.grid_width):
-                # draw the tile if the grid cell is occupied by a tile
-                if self.tile_matrix[row][col] is not None:
-                    self.tile_matrix[row][col].draw(Point(col, row))
-        # draw the inner lines of the grid
+    # Method for drawing the inner lines of the game grid
+    def draw_grid_lines(self):
         stddraw.setPenColor(self.line_color)
         stddraw.setPenRadius(self.line_thickness)
         # x and y ranges for the game grid
         start_x, end_x = -0.54, self.grid_width - 0.54
         start_y, end_y = -0.47, self.grid_height - 0.47
-        for x in np.arange(start_x + 1, end_x, 1):  # vertical inner lines
-            stddraw.line(x, start_y, x, end_y)
-        for y in np.arange(start_y + 1, end_y, 1):  # horizontal inner lines
-            stddraw.line(start_x, y, end_x, y)
+        xs = np.arange(start_x + 1, end_x, 1)  # vertical inner lines
+        stddraw.lines(xs, np.full(len(xs), start_y), xs, np.full(len(xs), end_y))
+        ys = np.arange(start_y + 1, end_y, 1)  # horizontal inner lines
+        stddraw.lines(np.full(len(ys), start_x), ys, np.full(len(ys), end_x), ys)
         stddraw.setPenRadius()  # reset the pen radius to its default value
 
     # Method for drawing the boundaries around the game grid
@@ -83,74 +171,25 @@ class GameGrid:
         # the coordinates of the bottom left corner of the game grid
         pos_x, pos_y = -0.5, -0.5
         stddraw.rectangle(pos_x, pos_y, self.grid_width, self.grid_height)
-        # set pen radius for info box boundaries
-        stddraw.rectangle(self.grid_width - 0.5, pos_y, self.info_width, self.grid_height)
+        # set pen radius for info box boundaries (there is no info box when the
+        # game grid is drawn alone, e.g. for thumbnails)
+        if self.info_width > 0:
+            stddraw.rectangle(self.grid_width - 0.5, pos_y, self.info_width, self.grid_height)
         stddraw.setPenRadius()  # reset the pen radius to its default value
 
-    # Method for drawing the information panel on the right side of the game grid (score, next tetromino, instructions, user interface key mapping,etc.)
-    def draw_info_panel(self):
+    # Method for drawing the fixed parts of the information panel on the right side of the game grid
+    # (background, labels, user interface key mapping and the exit button)
+    def draw_info_panel_chrome(self):
         stddraw.setPenColor(Color(84, 73, 78))
         stddraw.filledRectangle(self.grid_width - 0.5, -0.5, self.info_width, self.grid_height + 0.5)
         info_center_x_scale = self.grid_width + self.info_width / 2 - 0.5
         info_score_y_scale = self.grid_height - 1
         next_tetromino_y_scale = self.grid_height - 4
 
-        # Draw the score
         stddraw.setPenColor(Color(255, 255, 255))
         stddraw.setFontFamily("Arial")
         stddraw.setFontSize(20)
-        stddraw.boldText(info_center_x_scale, info_score_y_scale, "Your Score: " + str(self.score))
         stddraw.boldText(info_center_x_scale, next_tetromino_y_scale, "Next Tetromino: ")
-        stddraw.boldText(info_center_x_scale, info_score_y_scale - 1.5, "Best Score: " + str(self.max_score))
-
-
-        block_size = 1
-        block_spacing = 0.07
-
-        tetromino_base_x = info_center_x_scale - 0.5
-        tetromino_base_y = self.grid_height - 6
-        stddraw.setPenColor(Color(238, 228, 218))
-
-        if self.next_tetromino.type == 'I':
-            for i in range(4):
-                stddraw.filledRectangle(tetromino_base_x, tetromino_base_y - i * (block_size + block_spacing),
-                                        block_size, block_size)
-        elif self.next_tetromino.type == 'O':
-            offsets = [(0, 0), (0, -1), (1, 0), (1, -1)]
-            for dx, dy in offsets:
-                stddraw.filledRectangle(tetromino_base_x + dx * (block_size + block_spacing),
-                                        tetromino_base_y + dy * (block_size + block_spacing), block_size, block_size)
-        elif self.next_tetromino.type == 'S':
-            offsets = [(0, 0), (1, 0), (-1, -1), (0, -1)]
-            for dx, dy in offsets:
-                stddraw.filledRectangle(tetromino_base_x + dx * (block_size + block_spacing),
-                                        tetromino_base_y + dy * (block_size + block_spacing), block_size, block_size)
-        elif self.next_tetromino.type == 'Z':
-            offsets = [(0, 0), (-1, 0), (0, -1), (1, -1)]
-            for dx, dy in offsets:
-                stddraw.filledRectangle(tetromino_base_x + dx * (block_size + block_spacing),
-                                        tetromino_base_y + dy * (block_size + block_spacing), block_size, block_size)
-        elif self.next_tetromino.type == 'L':
-            for i in range(3):
-                stddraw.filledRectangle(tetromino_base_x, tetromino_base_y - i * (block_size + block_spacing),
-                                        block_size, block_size)
-            stddraw.filledRectangle(tetromino_base_x + block_size + block_spacing,
-                                    tetromino_base_y - 2 * (block_size + block_spacing), block_size, block_size)
-        elif self.next_tetromino.type == 'J':
-            for i in range(3):
-                stddraw.filledRectangle(tetromino_base_x, tetromino_base_y - i * (block_size + block_spacing),
-                                        block_size, block_size)
-            stddraw.filledRectangle(tetromino_base_x - (block_size + block_spacing),
-                                    tetromino_base_y - 2 * (block_size + block_spacing), block_size, block_size)
-        elif self.next_tetromino.type == 'T':
-            for dx in [-1, 0, 1]:
-                stddraw.filledRectangle(tetromino_base_x + dx * (block_size + block_spacing),
-                                        tetromino_base_y - (block_size + block_spacing), block_size, block_size)
-            stddraw.filledRectangle(tetromino_base_x, tetromino_base_y, block_size, block_size)
-
-        stddraw.setPenColor(Color(255, 255, 255))
-        stddraw.setFontFamily("Arial")
-        stddraw.setFontSize(20)
         stddraw.boldText(info_center_x_scale, info_score_y_scale - 11.5, "A-D = Rotate")
         stddraw.boldText(info_center_x_scale, info_score_y_scale - 12.5, "Left-Right = Move")
         stddraw.boldText(info_center_x_scale, info_score_y_scale - 13.5, "Space = Hard Drop")
@@ -159,135 +198,118 @@ class GameGrid:
         stddraw.boldText(info_center_x_scale, info_score_y_scale - 9, "R = Main Menu")
         stddraw.setPenColor(Color(0, 0, 0))
         stddraw.boldText(info_center_x_scale, info_score_y_scale - 10, "ESC = Stop Menu")
-        # Exit game button positioning
-        button_height = 1
-        button_width = self.info_width - 2
-        button_top = 0.5  # Distance from bottom of the info panel
-        button_center_y = button_top + button_height / 2
 
         stddraw.setPenColor(Color(90, 90, 90))
-        stddraw.filledRectangle(self.grid_width + 0.5, button_top, button_width, button_height)
+        stddraw.filledRectangle(self.grid_width + 0.5, self.exit_button_top, self.info_width - 2,
+                                self.exit_button_height)
         stddraw.setPenColor(Color(255, 255, 255))
         stddraw.setFontFamily("Arial")
         stddraw.setFontSize(20)
-        stddraw.boldText(info_center_x_scale, button_center_y, "Exit Game")
-
-        # Handle button click
-        if stddraw.mousePressed():
-            mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
-            if (self.grid_width + 0.5 <= mouse_x <= self.grid_width + button_width + 0.5 and
-                    button_top <= mouse_y <= button_top + button_height):
-                sys.exit()  # Exit the program if the button is clicked
-
-        # Method used for checking whether the grid cell with given row and column
-        # indexes is occupied by a tile or empty
+        stddraw.boldText(info_center_x_scale, self.exit_button_top + self.exit_button_height / 2, "Exit Game")
 
-    # Method used for checking whether the grid cell with given row and column indexes is occupied by a tile or empty
-    def is_occupied(self, row, col):
-        # considering newly entered tetrominoes to the game grid that may have
-        # tiles with position.y >= grid_height
-        if not self.is_inside(row, col):
-            return False
-        # the cell is occupied by a tile if it is not None
-        return self.tile_matrix[row][col] is not None
-
-    # Method used for checking whether the cell with given row and column indexes
-    # is inside the game grid or not
-    def is_inside(self, row, col):
-        if row < 0 or row >= self.grid_height:
-            return False
-        if col < 0 or col >= self.grid_width:
-            return False
-        return True
-
-    # Method that locks the tiles of the landed tetromino on the game grid while
-    # checking if the game is over due to having tiles above the topmost grid row.
-    # The method returns True when the game is over and False otherwise.
-    # The method also removes the full rows and shifts the tiles down.
-    # The method also merges the tiles with the same number and updates the score.
-    # The method also removes the flying tiles that are not connected to the ground.
-    # The method also checks if the score is greater than or equal to 2048 to end the game.
-    # Method will first merge, then remove flying tiles, then remove full rows and shift
-    # This order is given by the instructor
-    def update_grid(self, tiles_to_lock, blc_position):
-        # necessary for the display method to stop displaying the tetromino
-        self.current_tetromino = None
-
-        # lock the tiles of the current tetromino (tiles_to_lock) on the game grid
-        n_rows, n_cols = len(tiles_to_lock), len(tiles_to_lock[0])
-        for col in range(n_cols):
-            for row in range(n_rows):
-                # place each tile onto the game grid
-                if tiles_to_lock[row][col] is not None:
-                    # compute the position of the tile on the game grid
-                    pos_x = blc_position.x + col
-                    pos_y = blc_position.y + (n_rows - 1) - row
-                    # check if the position is inside the game grid
-                    if self.is_inside(pos_y, pos_x):
-                        self.tile_matrix[pos_y][pos_x] = tiles_to_lock[row][col]
-                    # the game is over if any placed tile is above the game grid
-
-                    else:
-                        self.game_over = True
-                        return self.game_over
-        previous_score = -1
-        while previous_score != self.score:
-            previous_score = self.score
-            self.score = Tile.merge_tiles(self.tile_matrix, self.score)
-        self.display()
-        self.remove_flying_tiles()
-        self.remove_full_rows_and_shift()
-
-        # After locking the tiles, remove the full rows and update the grid
-        # The game is over if the score is greater than or equal to 2048
-        if self.score >= 2048:
-            self.game_over = True
-        return self.game_over
-
-    # Method used for removing the full rows and shifting the tiles down
-    # The method also updates the score by adding the numbers on the removed tiles
-    def remove_full_rows_and_shift(self):
-        for row in range(self.grid_height):
-            if None not in self.tile_matrix[row]:
-                self.score += sum(tile.number for tile in self.tile_matrix[row] if tile is not None)
-                for shift_row in range(row, self.grid_height - 1):
-                    self.tile_matrix[shift_row] = self.tile_matrix[shift_row + 1]
-                self.tile_matrix[self.grid_height - 1] = [None] * self.grid_width
-                self.display()
-
-    # Method used for removing the flying tiles that are not connected to the ground
-    # The method also updates the score by adding the numbers on the removed tiles
-    # The method uses Depth First Search (DFS) algorithm to find the connected tiles
-    # Method first checks the top row, then iterates over the rest of the rows
-    # Method will first mark every tile as a false
-    def remove_flying_tiles(self):
-        visited = [[False] * self.grid_width for _ in range(self.grid_height)]
+    # Method for drawing the changing parts of the information panel on the right side of the game grid
+    # (the given score, best score and type of the next tetromino)
+    def draw_info_panel(self, score, max_score, next_type):
+        info_center_x_scale = self.grid_width + self.info_width / 2 - 0.5
+        info_score_y_scale = self.grid_height - 1
 
-        for col in range(self.grid_width):
-            if self.tile_matrix[0][col] is not None and not visited[0][col]:
-                self.dfs(0, col, visited)
+        # Draw the score
+        stddraw.setPenColor(Color(255, 255, 255))
+        stddraw.setFontFamily("Arial")
+        stddraw.setFontSize(20)
+        stddraw.boldText(info_center_x_scale, info_score_y_scale, "Your Score: " + str(score))
+        stddraw.boldText(info_center_x_scale, info_score_y_scale - 1.5, "Best Score: " + str(max_score))
 
-        for row in range(1, self.grid_height):
-            for col in range(self.grid_width):
-                if self.tile_matrix[row][col] is not None and not visited[row][col]:
-                    self.score += self.tile_matrix[row][col].number
-                    self.tile_matrix[row][col] = None
-                    self.display()
+        block_size = 1
+        block_spacing = 0.07
 
-    # Method used for Depth First Search (DFS) algorithm to find the connected tiles
-    # The method marks the visited tiles as True and recursively calls the DFS method
-    # for the neighboring tiles
-    # The method uses the visited matrix to keep track of the visited tiles
-    def dfs(self, row, col, visited):
-        if row < 0 or row >= self.grid_height or col < 0 or col >= self.grid_width:
-            return
+        tetromino_base_x = info_center_x_scale - 0.5
+        tetromino_base_y = self.grid_height - 6
+        stddraw.setPenColor(Color(238, 228, 218))
 
-        if visited[row][col] or self.tile_matrix[row][col] is None:
-            return
+        # draw the blocks of the next tetromino with a single batch call
+        offsets = np.array(GameGrid.preview_offsets[next_type])
+        stddraw.filledRectangles(tetromino_base_x + offsets[:, 0] * (block_size + block_spacing),
+                                 tetromino_base_y + offsets[:, 1] * (block_size + block_spacing),
+                                 np.full(len(offsets), block_size), np.full(len(offsets), block_size))
 
-        visited[row][col] = True
+        # Handle exit button click
+        button_width = self.info_width - 2
+        if stddraw.mousePressed():
+            mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
+            if (self.grid_width + 0.5 <= mouse_x <= self.grid_width + button_width + 0.5 and
+                    self.exit_button_top <= mouse_y <= self.exit_button_top + self.exit_button_height):
+                sys.exit()  # Exit the program if the button is clicked
 
-        self.dfs(row - 1, col, visited)
-        self.dfs(row + 1, col, visited)
-        self.dfs(row, col - 1, visited)
-        self.dfs(row, col + 1, visited)
+    # Method that returns the tile on the given cell of the game grid (None for an empty cell)
+    def get_tile(self, row, col):
+        return self.tile_matrix[self.row_slots[row], col]
+
+    # Method used for placing the given tile on the given cell of the game grid
+    def set_tile(self, row, col, tile):
+        slot = self.row_slots[row]
+        if self.tile_matrix[slot, col] is None:
+            self.row_counts[row] += 1
+            if self.row_counts[row] == self.grid_width:
+                self.full_rows.add(row)
+        self.tile_matrix[slot, col] = tile
+        self.number_matrix[row, col] = tile.number
+
+    # Method used for removing the tile on the given cell of the game grid, returns the removed tile
+    def clear_tile(self, row, col):
+        slot = self.row_slots[row]
+        tile = self.tile_matrix[slot, col]
+        if tile is not None:
+            self.row_counts[row] -= 1
+            self.full_rows.discard(row)
+            self.tile_matrix[slot, col] = None
+            self.number_matrix[row, col] = 0
+        return tile
+
+    # Method that locks the tiles of the landed tetromino on the game grid with the rules of GridRules,
+    # recording the steps of the lock on the animation timeline. Returns True when the game is over
+    def update_grid(self, tiles_to_lock, blc_position):
+        # the steps of the previous lock are outdated once a new tetromino is locked
+        self.animations.clear()
+        return super().update_grid(tiles_to_lock, blc_position)
+
+    # Method that returns the rows of the tiles of the given column from the bottom to the top
+    def column_rows(self, col):
+        return np.flatnonzero(self.number_matrix[:, col]).tolist()
+
+    # Method that returns the columns of the tiles of the given row from the left to the right
+    def row_columns(self, row):
+        return np.flatnonzero(self.number_matrix[row]).tolist()
+
+    # Method used for adding the current state of the game grid to the animation timeline as a
+    # step of the given kind, instead of displaying it and waiting
+    def add_animation_step(self, kind):
+        self.animations.add(kind, self.number_matrix.copy())
+
+    # Method that returns the numbers on the landed tiles as a read-only integer matrix
+    # (row 0 is the bottom row). The returned matrix is a view that always shows the
+    # current state of the game grid, so it does not need to be requested again
+    def get_number_matrix(self):
+        return self.number_matrix_view
+
+    # Method used for copying the numbers on the landed tiles into the given integer
+    # array of shape (grid_height, grid_width), e.g. one slot of a batch of observations
+    def copy_number_matrix_to(self, out):
+        np.copyto(out, self.number_matrix, casting='unsafe')
+
+    # Method used for removing the tiles of the given full row and shifting the tiles above it down by
+    # one row, returns the sum of the numbers on the removed tiles
+    def remove_row_and_shift(self, row):
+        slot = self.row_slots[row]
+        removed = sum(tile.number for tile in self.tile_matrix[slot])
+        self.tile_matrix[slot] = None
+        # the storage of the cleared row becomes the empty top row, so the rows above it are shifted
+        # down by moving their indexes in row_slots instead of copying their tiles
+        del self.row_slots[row]
+        self.row_slots.append(slot)
+        self.number_matrix[row:-1] = self.number_matrix[row + 1:]
+        self.number_matrix[-1] = 0
+        self.row_counts[row:-1] = self.row_counts[row + 1:]
+        self.row_counts[-1] = 0
+        self.full_rows = {r - 1 if r > row else r for r in self.full_rows if r != row}
+        return removed
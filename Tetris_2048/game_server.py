@@ -0,0 +1,241 @@
+import sys  # used for reading the command line arguments
+import json  # used for encoding the messages as lines of JSON
+import random  # used for creating tetrominoes with random types
+import asyncio  # used for serving all the games and connections on a single event loop
+import functools  # used for binding the grid size of each game to its tetromino factory
+import numpy as np  # used for finding the changed cells of the boards
+from game_grid import GameGrid  # the class for modeling the game grid
+from tetromino import Tetromino  # the class for modeling the tetrominoes
+from simulation import Simulation  # used for applying the keys and the gravity steps of the games
+
+# Protocol: each message is a line of JSON over TCP
+# Requests of the clients:
+#   {"op": "create", "width": 12, "height": 18, "speed": 250}  -> {"type": "created", "game": id}
+#                                                                 (the sizes and the speed as on the settings screen)
+#   {"op": "list"}                                             -> {"type": "games", "games": [[id, h, w, speed]]}
+#   {"op": "watch", "game": id} / {"op": "unwatch", "game": id}
+#   {"op": "key", "game": id, "key": "left"}                   (keys as in the game: left, right, down, a, d, space)
+# Messages streamed to the spectators of a game:
+#   keyframe: the full state (board as a list of rows, row 0 at the bottom) when a spectator joins, every
+#             keyframe_interval updates and for the spectators that fell behind
+#   delta:    only the changed cells ([row, col, number]), the piece and the next type when they changed and
+#             the score delta, numbered by seq so that a spectator can check that it missed nothing
+
+tetromino_types = ['I', 'O', 'Z', 'S', 'J', 'L', 'T']
+# the (min, max) grid sizes and speeds (in ms) that can be created, the same as on the settings screen of the game
+width_range, height_range, speed_range = (12, 24), (18, 24), (50, 500)
+
+
+# Function for creating a random tetromino for a game grid of the given size
+def create_tetromino(grid_h, grid_w):
+    return Tetromino(random.choice(tetromino_types), grid_h, grid_w)
+
+
+# Function for encoding a message as a line of JSON
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+# Class for a game hosted by the server and the connections of its spectators
+class HostedGame:
+    # the number of updates between two keyframes sent to every spectator
+    keyframe_interval = 100
+    # spectators with more unsent bytes than this miss the updates until they catch up with a keyframe
+    max_write_buffer = 1 << 16
+
+    # Constructor for creating a new game with the given grid size and speed
+    def __init__(self, game_id, grid_h, grid_w, game_speed):
+        self.game_id = game_id
+        self.grid = GameGrid(grid_h, grid_w, 0, game_speed)
+        self.grid.current_tetromino = create_tetromino(grid_h, grid_w)
+        self.grid.next_tetromino = create_tetromino(grid_h, grid_w)
+        # the keys and the gravity steps are applied with the methods of the simulation on the event
+        # loop of the server, the simulation thread is not started
+        self.simulation = Simulation(self.grid, None, functools.partial(create_tetromino, grid_h, grid_w))
+        self.snapshot = self.grid.snapshot()
+        self.seq = 0
+        self.updates_since_keyframe = 0
+        # the stream writers of the spectators, and of those that wait for a keyframe
+        self.spectators = set()
+        self.stale_spectators = set()
+
+    # Method that returns the keyframe message of the current snapshot
+    def keyframe(self):
+        snapshot = self.snapshot
+        return {"type": "keyframe", "game": self.game_id, "seq": self.seq, "board": snapshot.board.tolist(),
+                "piece": snapshot.piece, "next": snapshot.next_type, "score": snapshot.score,
+                "game_over": snapshot.game_over}
+
+    # Method that returns the delta message from the previous snapshot to the current one
+    def delta(self, previous):
+        snapshot = self.snapshot
+        message = {"type": "delta", "game": self.game_id, "seq": self.seq}
+        # the board of the snapshots is copied only when a tetromino is locked
+        if snapshot.board is not previous.board:
+            rows, cols = np.nonzero(snapshot.board != previous.board)
+            message["cells"] = np.column_stack((rows, cols, snapshot.board[rows, cols])).tolist()
+        if snapshot.piece != previous.piece:
+            message["piece"] = snapshot.piece
+        if snapshot.next_type != previous.next_type:
+            message["next"] = snapshot.next_type
+        if snapshot.score != previous.score:
+            message["score_delta"] = snapshot.score - previous.score
+        if snapshot.game_over:
+            message["game_over"] = True
+        return message
+
+    # Method used for adding a spectator, who receives a keyframe first
+    def add_spectator(self, writer):
+        self.spectators.add(writer)
+        self.stale_spectators.add(writer)
+        self.send_keyframes(self.stale_spectators)
+
+    # Method used for removing a spectator
+    def remove_spectator(self, writer):
+        self.spectators.discard(writer)
+        self.stale_spectators.discard(writer)
+
+    # Method used for sending the current keyframe to the given spectators that can take it
+    # The spectators that cannot take it are stale until they get a later keyframe, as they missed an update
+    def send_keyframes(self, spectators):
+        data = None
+        for writer in list(spectators):
+            if writer.transport.get_write_buffer_size() <= HostedGame.max_write_buffer:
+                # the keyframe is encoded once for all the spectators
+                data = data or encode(self.keyframe())
+                writer.write(data)
+                self.stale_spectators.discard(writer)
+            else:
+                self.stale_spectators.add(writer)
+
+    # Method used for applying the given key to the game
+    def apply_key(self, key):
+        if not self.grid.game_over:
+            self.simulation.apply_key(key)
+            self.update()
+
+    # Method used for the gravity step of the game
+    def gravity_step(self):
+        self.simulation.gravity_step()
+        self.update()
+
+    # Method used for streaming the changes of the game since the last update to the spectators
+    def update(self):
+        previous, self.snapshot = self.snapshot, self.grid.snapshot()
+        if (self.snapshot.board is previous.board and self.snapshot.piece == previous.piece
+                and self.snapshot.score == previous.score and self.snapshot.game_over == previous.game_over):
+            return
+        self.seq += 1
+        self.updates_since_keyframe += 1
+        if self.updates_since_keyframe >= HostedGame.keyframe_interval:
+            self.updates_since_keyframe = 0
+            self.send_keyframes(self.spectators)
+            return
+        data = encode(self.delta(previous))
+        for writer in self.spectators:
+            if writer in self.stale_spectators:
+                continue
+            if writer.transport.get_write_buffer_size() > HostedGame.max_write_buffer:
+                # a slow spectator is not sent any more deltas until it catches up with a keyframe
+                self.stale_spectators.add(writer)
+            else:
+                writer.write(data)
+        # the spectators that drained their buffer catch up with a keyframe
+        if self.stale_spectators:
+            self.send_keyframes(self.stale_spectators)
+
+
+# Class for the server hosting the games and streaming them to the spectators on an asyncio event loop
+class GameServer:
+    # Constructor for creating a server without games
+    def __init__(self):
+        self.games = {}
+        self.next_game_id = 1
+
+    # Method used for creating a game and starting its gravity steps
+    def create_game(self, grid_h, grid_w, game_speed):
+        game = HostedGame(self.next_game_id, grid_h, grid_w, game_speed)
+        self.games[game.game_id] = game
+        self.next_game_id += 1
+        asyncio.get_running_loop().create_task(self.run_game(game))
+        return game
+
+    # Method run as a task for the gravity steps of the given game until the game is over
+    async def run_game(self, game):
+        while not game.grid.game_over:
+            await asyncio.sleep(game.grid.game_speed / 1000)
+            game.gravity_step()
+        del self.games[game.game_id]
+
+    # Method used for handling a request of a client, returns the response message (or None)
+    def handle_request(self, request, writer, watched_games):
+        op = request.get("op")
+        if op == "create":
+            grid_h, grid_w = int(request.get("height", 18)), int(request.get("width", 12))
+            game_speed = int(request.get("speed", 250))
+            if not (height_range[0] <= grid_h <= height_range[1] and width_range[0] <= grid_w <= width_range[1]
+                    and speed_range[0] <= game_speed <= speed_range[1]):
+                return {"type": "error", "message": f"the width must be in {width_range}, the height in "
+                                                    f"{height_range} and the speed in {speed_range}"}
+            game = self.create_game(grid_h, grid_w, game_speed)
+            return {"type": "created", "game": game.game_id}
+        if op == "list":
+            return {"type": "games", "games": [[game.game_id, game.grid.grid_height, game.grid.grid_width,
+                                                game.grid.game_speed] for game in self.games.values()]}
+        game = self.games.get(request.get("game"))
+        if game is None:
+            return {"type": "error", "message": "unknown game or operation"}
+        if op == "watch":
+            game.add_spectator(writer)
+            watched_games.add(game)
+        elif op == "unwatch":
+            game.remove_spectator(writer)
+            watched_games.discard(game)
+        elif op == "key":
+            game.apply_key(request.get("key"))
+        else:
+            return {"type": "error", "message": "unknown operation"}
+        return None
+
+    # Method run as a task for each connection, handling the requests of the client line by line
+    async def handle_connection(self, reader, writer):
+        watched_games = set()
+        try:
+            while True:
+                # a line longer than the limit of the reader is dropped with an error reply
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    line, response = None, {"type": "error", "message": "request too long"}
+                if line == b"":
+                    break
+                if line is not None:
+                    try:
+                        response = self.handle_request(json.loads(line), writer, watched_games)
+                    except (ValueError, TypeError, AttributeError):
+                        response = {"type": "error", "message": "invalid request"}
+                if response is not None:
+                    writer.write(encode(response))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game in watched_games:
+                game.remove_spectator(writer)
+            writer.close()
+
+    # Method used for serving the clients on the given host and port (and creating the given number of games)
+    async def serve(self, host, port, n_games=0):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        for _ in range(n_games):
+            self.create_game(18, 12, 250)
+        async with server:
+            await server.serve_forever()
+
+
+# Usage: python game_server.py [PORT] [NUMBER_OF_GAMES]
+# The server listens on localhost and can start the given number of 18 x 12 games with the default speed
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8048
+    n_games = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    asyncio.run(GameServer().serve("127.0.0.1", port, n_games))
@@ -0,0 +1,171 @@
+import bisect  # used for finding the first tile of a column that may merge
+from tile import Tile  # used for merging the tiles of the columns
+from connectivity import find_flying_tiles, cells_around  # used for finding the flying tiles near the changes
+
+
+# Class used for the rules of locking a tetromino (lock, merge, remove the flying tiles, clear the full rows
+# and shift) shared by GameGrid and SparseGameGrid, so that both grids always give the same results
+# The grids only differ in how they store their tiles, so each of them provides the methods for reading and
+# changing its storage: get_tile, set_tile, clear_tile, column_rows, row_columns and remove_row_and_shift
+class GridRules:
+    # Constructor for creating the state of the rules of a game grid with the given size
+    def __init__(self, grid_h, grid_w):
+        self.grid_height = grid_h
+        self.grid_width = grid_w
+        # the tetromino that is currently being moved on the game grid and the next tetromino to be moved
+        self.current_tetromino = None
+        self.next_tetromino = None
+        # the game_over flag shows whether the game is over or not
+        self.game_over = False
+        # set the score to 0 at the beginning of the game
+        self.score = 0
+        # the number of locked tetrominoes and the statistics of the last lock, recorded by the telemetry
+        # of the game
+        self.lock_count = 0
+        self.lock_stats = {'merges': 0, 'rows_cleared': 0, 'flying_tiles': 0}
+        # the rows whose tiles may have been disconnected from the ground by a row clear, which are
+        # checked for flying tiles on the next lock
+        self.unchecked_rows = set()
+        # the lowest row of each column where a row clear made two tiles adjacent, which are merged
+        # on the next lock
+        self.dirty_columns = {}
+
+    # Method used for checking whether the grid cell with given row and column indexes is occupied by a tile or empty
+    def is_occupied(self, row, col):
+        # considering newly entered tetrominoes to the game grid that may have
+        # tiles with position.y >= grid_height
+        if not self.is_inside(row, col):
+            return False
+        # the cell is occupied by a tile if it is not None
+        return self.get_tile(row, col) is not None
+
+    # Method used for checking whether the cell with given row and column indexes
+    # is inside the game grid or not
+    def is_inside(self, row, col):
+        if row < 0 or row >= self.grid_height:
+            return False
+        if col < 0 or col >= self.grid_width:
+            return False
+        return True
+
+    # Method that locks the tiles of the landed tetromino on the game grid while
+    # checking if the game is over due to having tiles above the topmost grid row.
+    # The method returns True when the game is over and False otherwise.
+    # The method also removes the full rows and shifts the tiles down.
+    # The method also merges the tiles with the same number and updates the score.
+    # The method also removes the flying tiles that are not connected to the ground.
+    # The method also checks if the score is greater than or equal to 2048 to end the game.
+    # Method will first merge, then remove flying tiles, then remove full rows and shift
+    # This order is given by the instructor
+    def update_grid(self, tiles_to_lock, blc_position):
+        # necessary for the display method to stop displaying the tetromino
+        self.current_tetromino = None
+        self.lock_count += 1
+        self.lock_stats = {'merges': 0, 'rows_cleared': 0, 'flying_tiles': 0}
+        # the columns to merge with their lowest changed rows (the locked tiles are added below)
+        dirty_columns, self.dirty_columns = self.dirty_columns, {}
+
+        # lock the tiles of the current tetromino (tiles_to_lock) on the game grid
+        n_rows, n_cols = len(tiles_to_lock), len(tiles_to_lock[0])
+        for col in range(n_cols):
+            for row in range(n_rows):
+                # place each tile onto the game grid
+                if tiles_to_lock[row][col] is not None:
+                    # compute the position of the tile on the game grid
+                    pos_x = blc_position.x + col
+                    pos_y = blc_position.y + (n_rows - 1) - row
+                    # check if the position is inside the game grid
+                    if self.is_inside(pos_y, pos_x):
+                        self.set_tile(pos_y, pos_x, tiles_to_lock[row][col])
+                        dirty_columns[pos_x] = min(dirty_columns.get(pos_x, pos_y), pos_y)
+                    # the game is over if any placed tile is above the game grid
+
+                    else:
+                        self.game_over = True
+                        return self.game_over
+        # merges happen in a column only, so only the columns that changed since they were last merged
+        # can merge (the columns of the locked tiles and the columns shifted by a row clear)
+        changed_cells = []
+        for col, changed_row in dirty_columns.items():
+            changed_cells += self.merge_column(col, changed_row)
+        self.add_animation_step('merge')
+        # a locked tetromino lands on the ground or on a grounded tile, so only the merges and the row
+        # clears of the previous lock can disconnect tiles from the ground
+        for row in self.unchecked_rows:
+            changed_cells += [(row, col) for col in self.row_columns(row)]
+        self.unchecked_rows = set()
+        if changed_cells:
+            self.remove_flying_tiles(changed_cells)
+        self.remove_full_rows_and_shift()
+
+        # After locking the tiles, remove the full rows and update the grid
+        # The game is over if the score is greater than or equal to 2048
+        if self.score >= 2048:
+            self.game_over = True
+        return self.game_over
+
+    # Method used for merging the tiles of the given column with Tile.merge_column (repeated until there
+    # is nothing left to merge), where the tiles below changed_row - 1 cannot merge
+    # Returns the cells of the column whose tiles changed
+    def merge_column(self, col, changed_row):
+        rows = self.column_rows(col)
+        entries = [[row, self.get_tile(row, col)] for row in rows]
+        score, merges, lowest_row = Tile.merge_column(entries, bisect.bisect_left(rows, changed_row - 1))
+        if merges == 0:
+            return []
+        self.score += score
+        self.lock_stats['merges'] += merges
+        # the tiles above the lowest merged tile moved down, up to the top of the column
+        for row in rows[bisect.bisect_left(rows, lowest_row):]:
+            self.clear_tile(row, col)
+        for row, tile in entries:
+            if row >= lowest_row:
+                self.set_tile(row, col, tile)
+        return [(row, col) for row in range(lowest_row, rows[-1] + 1)]
+
+    # Method used for recording the current state of the game grid as a step of the given kind of the
+    # lock animation (the grids without an animation record nothing)
+    def add_animation_step(self, kind):
+        pass
+
+    # Method used for removing the full rows and shifting the tiles down
+    # The method also updates the score by adding the numbers on the removed tiles
+    # The rows are checked from the bottom to the top once, so a full row right above a cleared row
+    # (which is shifted onto the row that was just checked) is cleared on the next lock
+    def remove_full_rows_and_shift(self):
+        cleared_rows = []
+        for row in sorted(self.full_rows):
+            if row - 1 not in cleared_rows:
+                cleared_rows.append(row)
+        # each cleared row shifts the rows above it down by one
+        for shift, row in enumerate(cleared_rows):
+            self.clear_row(row - shift)
+
+    # Method used for removing the given full row, adding its numbers to the score and shifting the
+    # tiles above it down by one row
+    def clear_row(self, row):
+        self.score += self.remove_row_and_shift(row)
+        self.lock_stats['rows_cleared'] += 1
+        # the tiles shifted onto the cleared row and the tiles below it are no longer connected
+        # through the cleared row, so they are checked for flying tiles on the next lock
+        self.unchecked_rows = {r - 1 if r > row else r for r in self.unchecked_rows}
+        self.unchecked_rows.update((row - 1, row) if row > 0 else (row,))
+        # a tile shifted onto the cleared row may merge with the tile below it on the next lock
+        self.dirty_columns = {col: r - 1 if r > row else r for col, r in self.dirty_columns.items()}
+        if row > 0:
+            for col in self.row_columns(row):
+                if self.get_tile(row - 1, col) is not None:
+                    self.dirty_columns[col] = min(self.dirty_columns.get(col, row), row)
+        self.add_animation_step('clear')
+
+    # Method used for removing the flying tiles that are not connected to the ground
+    # The method also updates the score by adding the numbers on the removed tiles
+    # Only the tiles on and next to the given changed cells can have been disconnected since the last
+    # check, so only their components are searched instead of the whole grid
+    def remove_flying_tiles(self, changed_cells):
+        flying_tiles = find_flying_tiles(self.is_occupied, cells_around(changed_cells))
+        # the tiles are removed from the bottom row to the top row as the steps of the animation
+        for row, col in sorted(flying_tiles):
+            self.score += self.clear_tile(row, col).number
+            self.lock_stats['flying_tiles'] += 1
+            self.add_animation_step('flying')
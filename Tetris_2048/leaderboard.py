@@ -0,0 +1,100 @@
+import os  # used for checking the legacy best score file
+import time  # used for the date of the records
+import queue  # used for passing the records to the writer thread
+import atexit  # used for writing the pending records before the program exits
+import sqlite3  # used as the crash-safe, indexed score store
+import threading  # used for writing the records off the game loop
+
+
+# A class for storing the results of the finished games in a local SQLite database
+# The database is opened in WAL mode, so every record is written atomically and a crash can at most lose
+# the records that were not committed yet. The records are written by a background thread, so recording
+# a game never stalls the game loop
+class Leaderboard:
+    # Constructor that opens (or creates) the database and starts the writer thread
+    # The best score in legacy_file_path (the old best_score.txt) is imported when the database is empty
+    def __init__(self, file_path, legacy_file_path=None):
+        self.file_path = file_path
+        # the connection of the main thread, used only for reading
+        self.connection = self.connect()
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "id INTEGER PRIMARY KEY, score INTEGER NOT NULL, max_tile INTEGER, grid_width INTEGER, "
+                "grid_height INTEGER, speed INTEGER, duration REAL, replay TEXT, created_at REAL NOT NULL)")
+            # top-N queries per configuration are answered from this index without scanning the table
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS scores_by_config ON scores (grid_width, grid_height, speed, score DESC)")
+        # the best score is kept in memory so that it is not read from the disk on every restart
+        self.max_score = self.connection.execute("SELECT COALESCE(MAX(score), 0) FROM scores").fetchone()[0]
+        is_empty = self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 0
+        if is_empty and legacy_file_path is not None and os.path.exists(legacy_file_path):
+            self.import_legacy_best_score(legacy_file_path)
+        self.records = queue.Queue()
+        self.writer = threading.Thread(target=self.write_records, daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    # Method for opening a connection to the database in WAL mode
+    def connect(self):
+        connection = sqlite3.connect(self.file_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # in WAL mode, NORMAL keeps every commit atomic without an fsync on each of them
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # Method for importing the best score of the legacy text file as a record without a configuration
+    def import_legacy_best_score(self, legacy_file_path):
+        try:
+            with open(legacy_file_path, "r") as file:
+                score = int(file.read().strip())
+        except ValueError:
+            return
+        # a best score of 0 (as in the shipped file) means that no game was played, so there is nothing to import
+        if score <= 0:
+            return
+        with self.connection:
+            self.connection.execute("INSERT INTO scores (score, created_at) VALUES (?, ?)", (score, time.time()))
+        self.max_score = max(self.max_score, score)
+
+    # Method for recording a finished game without waiting for it to be written
+    # replay is an optional reference (e.g. a file name) to the replay of the game
+    def record(self, score, max_tile, grid_width, grid_height, speed, duration, replay=None):
+        self.max_score = max(self.max_score, score)
+        self.records.put((score, max_tile, grid_width, grid_height, speed, duration, replay, time.time()))
+
+    # Method run by the writer thread: writes the queued records, all records that are waiting in the
+    # queue in one transaction, until None is received
+    def write_records(self):
+        connection = self.connect()
+        running = True
+        while running:
+            records = [self.records.get()]
+            while not self.records.empty():
+                records.append(self.records.get())
+            if None in records:
+                running = False
+                records = [record for record in records if record is not None]
+            with connection:
+                connection.executemany(
+                    "INSERT INTO scores (score, max_tile, grid_width, grid_height, speed, duration, replay, "
+                    "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+        connection.close()
+
+    # Method for writing the pending records and stopping the writer thread
+    def close(self):
+        if self.writer.is_alive():
+            self.records.put(None)
+            self.writer.join()
+
+    # Method that returns the best score of all games (including the recorded ones not written yet)
+    def best_score(self):
+        return self.max_score
+
+    # Method that returns the n best written records of the given configuration, best first, as
+    # (score, max_tile, duration, replay, created_at) tuples
+    def top_scores(self, grid_width, grid_height, speed, n=10):
+        return self.connection.execute(
+            "SELECT score, max_tile, duration, replay, created_at FROM scores "
+            "WHERE grid_width = ? AND grid_height = ? AND speed = ? ORDER BY score DESC LIMIT ?",
+            (grid_width, grid_height, speed, n)).fetchall()
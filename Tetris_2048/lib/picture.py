@@ -7,6 +7,7 @@ The picture module defines the Picture class.
 #-----------------------------------------------------------------------
 
 import os
+import threading
 import lib.color as color
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = 'hide'
@@ -52,9 +53,26 @@ class Picture:
             self._surface.fill((0, 0, 0))
         else:
             raise ValueError()
+        self._converted = False
             
     #-------------------------------------------------------------------
 
+    def _convert(self):
+        """
+        Convert the pixels of self to the pixel format of the display,
+        so that drawing self is a plain blit. Does nothing if self was
+        already converted or if the display has not been created yet.
+        """
+        if self._converted or pygame.display.get_surface() is None:
+            return
+        if self._surface.get_flags() & pygame.SRCALPHA:
+            self._surface = self._surface.convert_alpha()
+        else:
+            self._surface = self._surface.convert()
+        self._converted = True
+
+    #-------------------------------------------------------------------
+
     def save(self, f):
         """
         Save self to the file whose name is f.
@@ -95,3 +113,46 @@ class Picture:
         """
         pygameColor = pygame.Color(c.getRed(), c.getGreen(), c.getBlue(), 0)
         self._surface.set_at((x, y), pygameColor)
+
+#-----------------------------------------------------------------------
+
+# Process-wide cache of the pictures loaded from files, so that every
+# image file is read and decoded only once.
+
+_cache = {}
+_cacheLock = threading.Lock()
+
+def load(fileName):
+    """
+    Return a Picture read from the file whose name is fileName. The file
+    is read only once per process, and later calls return the same
+    Picture, so the returned Picture must not be modified. If the display
+    has been created, the Picture is converted to its pixel format.
+    """
+    with _cacheLock:
+        pic = _cache.get(fileName)
+        if pic is None:
+            pic = Picture(fileName)
+            _cache[fileName] = pic
+    pic._convert()
+    return pic
+
+def preload(fileNames):
+    """
+    Start reading the files whose names are in fileNames into the cache
+    in a background thread, and return the thread. The pixel format
+    conversion is left to the first load() call of each file.
+    """
+    def _loadAll():
+        for fileName in fileNames:
+            with _cacheLock:
+                if fileName in _cache:
+                    continue
+                try:
+                    _cache[fileName] = Picture(fileName)
+                except IOError:
+                    # Leave the error to be raised by load().
+                    pass
+    thread = threading.Thread(target=_loadAll, daemon=True)
+    thread.start()
+    return thread
@@ -10,15 +10,15 @@ commonly used Color objects defined in the color module.
 import time
 import os
 import sys
+import collections
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = 'hide'
-import pygame
-import pygame.gfxdraw
-import pygame.font
 
-import tkinter as Tkinter
-import tkinter.messagebox as tkMessageBox
-import tkinter.filedialog as tkFileDialog
+# pygame and numpy are imported by _initPygame() when the canvas is
+# created, and Tkinter only by the dialog box functions, so that
+# importing this module costs nothing for programs that never draw.
+pygame = None
+numpy = None
 	
 #-----------------------------------------------------------------------
 
@@ -74,11 +74,14 @@ _canvasWidth = float(_DEFAULT_CANVAS_SIZE)
 _canvasHeight = float(_DEFAULT_CANVAS_SIZE)
 _penRadius = None
 _penColor = _DEFAULT_PEN_COLOR
-_keysTyped = []
+_keysTyped = collections.deque()
 
 # Has the window been created?
 _windowCreated = False
 
+# Is the canvas an off-screen surface without a window?
+_offscreen = False
+
 #-----------------------------------------------------------------------
 # Begin added by Alan J. Broder
 #-----------------------------------------------------------------------
@@ -107,6 +110,21 @@ def _pygameColor(c):
     b = c.getBlue()
     return pygame.Color(r, g, b)
 
+# Cache of the fonts used so far, keyed by (family, size, bold), since
+# looking up a system font is much slower than rendering with it.
+_fonts = {}
+
+def _font(family, size, bold=False):
+    """
+    Return the pygame font with the given family, size and boldness.
+    """
+    key = (family, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(family, size, bold)
+        _fonts[key] = font
+    return font
+
 #-----------------------------------------------------------------------
 
 # Private functions to scale and factor X and Y values.
@@ -139,30 +157,56 @@ def _userY(y):
     
 #-----------------------------------------------------------------------
 
-def setCanvasSize(w=_DEFAULT_CANVAS_SIZE, h=_DEFAULT_CANVAS_SIZE):
+def _initPygame():
+    """
+    Import pygame and numpy and initialize the fonts, once.
+    """
+    global pygame
+    global numpy
+    if pygame is not None:
+        return
+    import pygame.gfxdraw
+    import pygame.font
+    import pygame.surfarray
+    import pygame.pixelcopy
+    import pygame.transform
+    import numpy
+    pygame.font.init()
+
+def setCanvasSize(w=_DEFAULT_CANVAS_SIZE, h=_DEFAULT_CANVAS_SIZE,
+                  offscreen=False):
     """
     Set the size of the canvas to w pixels wide and h pixels high.
     Calling this function is optional. If you call it, you must do
-    so before calling any drawing function.
+    so before calling any drawing function. If offscreen is True, then
+    draw on a plain off-screen surface: no window is created, show()
+    does not wait, and no events are read. The size of an off-screen
+    canvas can be set again later.
     """
     global _background
     global _surface
     global _canvasWidth
     global _canvasHeight
     global _windowCreated
+    global _offscreen
 
-    if _windowCreated:
+    if _windowCreated and not (_offscreen and offscreen):
         raise Exception('The stddraw window already was created')
 
     if (w < 1) or (h < 1):
         raise Exception('width and height must be positive')
 
+    _initPygame()
     _canvasWidth = w
     _canvasHeight = h
-    _background = pygame.display.set_mode([w, h])
-    pygame.display.set_caption('stddraw window (r-click to save)')
+    if offscreen:
+        _background = None
+    else:
+        _background = pygame.display.set_mode([w, h])
+        pygame.display.set_caption('stddraw window (r-click to save)')
     _surface = pygame.Surface((w, h))
     _surface.fill(_pygameColor(WHITE))
+    _offscreen = offscreen
     _windowCreated = True
 
 def setXscale(min=_DEFAULT_XMIN, max=_DEFAULT_XMAX):
@@ -468,7 +512,7 @@ def text(x, y, s):
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize)
+    font = _font(_fontFamily, _fontSize)
     text = font.render(s, 1, _pygameColor(_penColor))
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
@@ -482,11 +526,83 @@ def boldText(x, y, s):
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize, True)
+    font = _font(_fontFamily, _fontSize, True)
     text = font.render(s, 1, _pygameColor(_penColor))
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
 
+#-----------------------------------------------------------------------
+
+# Batch versions of the drawing functions. They take sequences or NumPy
+# arrays of coordinates, scale all of them in one vectorized step, and
+# then draw without the per-call checks and conversions.
+
+def _scaleRects(x, y, w, h):
+    """
+    Return the rectangles of widths w and heights h whose lower left
+    points are (x[i], y[i]) as a list of integer [left, top, width,
+    height] lists of canvas pixels.
+    """
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    w = numpy.asarray(w, dtype=float)
+    h = numpy.asarray(h, dtype=float)
+    sx = _canvasWidth / (_xmax - _xmin)
+    sy = _canvasHeight / (_ymax - _ymin)
+    left = numpy.rint((x - _xmin) * sx)
+    right = numpy.rint((x + w - _xmin) * sx)
+    top = numpy.rint((_ymax - y - h) * sy)
+    bottom = numpy.rint((_ymax - y) * sy)
+    rects = numpy.stack([left, top, right - left, bottom - top], axis=-1)
+    return rects.astype(int).tolist()
+
+def filledRectangles(x, y, w, h, colors=None):
+    """
+    Draw on the background canvas the filled rectangles of widths w[i]
+    and heights h[i] whose lower left points are (x[i], y[i]). colors
+    is a sequence of color.Color objects, one for each rectangle, and
+    defaults to the pen color for all of them.
+    """
+    _makeSureWindowCreated()
+    rects = _scaleRects(x, y, w, h)
+    if colors is None:
+        c = _pygameColor(_penColor)
+        for rect in rects:
+            _surface.fill(c, rect)
+    else:
+        for rect, c in zip(rects, colors):
+            _surface.fill(_pygameColor(c), rect)
+
+def lines(x0, y0, x1, y1):
+    """
+    Draw on the background canvas the lines from (x0[i], y0[i]) to
+    (x1[i], y1[i]) with the pen color and radius.
+    """
+    _makeSureWindowCreated()
+    sx = _canvasWidth / (_xmax - _xmin)
+    sy = _canvasHeight / (_ymax - _ymin)
+    x0s = (numpy.asarray(x0, dtype=float) - _xmin) * sx
+    x1s = (numpy.asarray(x1, dtype=float) - _xmin) * sx
+    y0s = (_ymax - numpy.asarray(y0, dtype=float)) * sy
+    y1s = (_ymax - numpy.asarray(y1, dtype=float)) * sy
+    lineWidth = _penRadius
+    if lineWidth == 0.0: lineWidth = 1.0
+    lineWidth = int(round(lineWidth))
+    c = _pygameColor(_penColor)
+    points = numpy.stack([x0s, y0s, x1s, y1s], axis=-1).tolist()
+    for x0s, y0s, x1s, y1s in points:
+        pygame.draw.line(_surface, c, (x0s, y0s), (x1s, y1s), lineWidth)
+
+def blits(images, x, y):
+    """
+    Draw on the background canvas each image images[i] (as returned by
+    renderText()) centered at (x[i], y[i]), with a single blit call.
+    """
+    _makeSureWindowCreated()
+    xs = (numpy.asarray(x, dtype=float) - _xmin) * (_canvasWidth / (_xmax - _xmin))
+    ys = (_ymax - numpy.asarray(y, dtype=float)) * (_canvasHeight / (_ymax - _ymin))
+    blitsPixels(images, numpy.stack([xs, ys], axis=-1).tolist())
+
 def picture(pic, x=None, y=None):
     """
     Draw pic on the background canvas centered at (x, y).  pic is an
@@ -517,6 +633,144 @@ def clear(c=WHITE):
     _makeSureWindowCreated()
     _surface.fill(_pygameColor(c))
 
+def canvasSize():
+    """
+    Return the size of the canvas as a (width, height) tuple of pixels.
+    """
+    return (int(_canvasWidth), int(_canvasHeight))
+
+#-----------------------------------------------------------------------
+
+# Functions for drawing in canvas pixel coordinates. They let clients
+# convert coordinates and colors once and then draw many times with
+# plain integer fills and blits.
+
+def pixelRect(x, y, w, h):
+    """
+    Return the rectangle of width w and height h whose lower left point
+    is (x, y) as an integer (left, top, width, height) tuple of canvas
+    pixels. The corners are rounded to the nearest pixel, so rectangles
+    that share an edge in user coordinates share it in pixels too.
+    """
+    left = int(round(_scaleX(x)))
+    right = int(round(_scaleX(x + w)))
+    top = int(round(_scaleY(y + h)))
+    bottom = int(round(_scaleY(y)))
+    return (left, top, right - left, bottom - top)
+
+def penWidth(r=None):
+    """
+    Return the width in pixels of the lines drawn with pen radius r,
+    which defaults to the current pen radius.
+    """
+    if r is None:
+        radius = _penRadius
+    else:
+        radius = float(r) * float(_DEFAULT_CANVAS_SIZE)
+    return max(1, int(round(radius)))
+
+def mapColor(c):
+    """
+    Return c, an object of type color.Color, converted to the pixel
+    format of the canvas, for use with fillPixelRect().
+    """
+    _makeSureWindowCreated()
+    return _surface.map_rgb((c.getRed(), c.getGreen(), c.getBlue()))
+
+def fillPixelRect(rect, c, width=0):
+    """
+    Fill the pixel rectangle rect (as returned by pixelRect()) with the
+    color c, as returned by mapColor(). If width is positive, then only
+    draw the outline of rect with lines that are width pixels wide.
+    """
+    if width > 0:
+        pygame.draw.rect(_surface, c, rect, width)
+    else:
+        _surface.fill(c, rect)
+
+def renderText(s, c, family=_DEFAULT_FONT_FAMILY, size=_DEFAULT_FONT_SIZE,
+               bold=False):
+    """
+    Return an image of string s written in color c (an object of type
+    color.Color) with the given font, to be drawn with blitPixels().
+    """
+    _makeSureWindowCreated()
+    return _font(family, size, bold).render(s, 1, _pygameColor(c))
+
+def blitPixels(image, center):
+    """
+    Draw image (as returned by renderText()) on the background canvas
+    centered at the pixel position center.
+    """
+    _surface.blit(image, image.get_rect(center=center))
+
+def pixelArray(a, rect):
+    """
+    Draw the image whose RGB pixels are in the NumPy array a of shape
+    (height, width, 3), scaled to fill the pixel rectangle rect (as
+    returned by pixelRect()) with a single blit. Each element of a
+    becomes a block of pixels, so a small array can cover a large area.
+    """
+    _makeSureWindowCreated()
+    image = pygame.surfarray.make_surface(a.transpose(1, 0, 2))
+    image = pygame.transform.scale(image, (rect[2], rect[3]))
+    _surface.blit(image, (rect[0], rect[1]))
+
+def blitsPixels(images, centers):
+    """
+    Draw each image images[i] (as returned by renderText()) on the
+    background canvas centered at the pixel position centers[i], with
+    a single blit call.
+    """
+    _surface.blits([(image, image.get_rect(center=center))
+                    for image, center in zip(images, centers)], False)
+
+#-----------------------------------------------------------------------
+
+# Functions for composing drawings once into off-screen layers that can
+# later be copied onto the background canvas with a single blit.
+
+_LAYER_COLORKEY = (255, 0, 255)
+_layerStack = []
+
+def beginLayer(transparent=False):
+    """
+    Redirect all subsequent drawing to a new off-screen layer of the
+    same size as the canvas. If transparent is True, then the pixels
+    that are not drawn on are left see-through when the layer is
+    drawn. Layers must be closed with endLayer().
+    """
+    global _surface
+    _makeSureWindowCreated()
+    layer = pygame.Surface((int(_canvasWidth), int(_canvasHeight)))
+    if transparent:
+        layer.fill(_LAYER_COLORKEY)
+        layer.set_colorkey(_LAYER_COLORKEY)
+    _layerStack.append(_surface)
+    _surface = layer
+
+def endLayer():
+    """
+    Stop drawing on the layer opened by the most recent beginLayer()
+    call, restore drawing to the previous canvas, and return the layer.
+    """
+    global _surface
+    if not _layerStack:
+        raise Exception('endLayer() called without beginLayer()')
+    layer = _surface
+    _surface = _layerStack.pop()
+    return layer
+
+def layer(l):
+    """
+    Draw the layer l (as returned by endLayer()) on the background
+    canvas, covering the whole canvas.
+    """
+    _makeSureWindowCreated()
+    _surface.blit(l, (0, 0))
+
+#-----------------------------------------------------------------------
+
 def save(f):
     """
     Save the window canvas to file f.
@@ -535,12 +789,41 @@ def save(f):
 
     pygame.image.save(_surface, f)
 
+def tobytes():
+    """
+    Return the pixels of the canvas as raw RGB bytes, three bytes per
+    pixel, row by row from the top left corner.
+    """
+    _makeSureWindowCreated()
+    return pygame.image.tobytes(_surface, 'RGB')
+
+def pixels():
+    """
+    Return a NumPy array of shape (height, width, 3) that is a view of
+    the RGB pixels of the canvas, without copying them. The canvas is
+    locked while the view exists, so the view must be deleted before
+    drawing on the canvas again.
+    """
+    _makeSureWindowCreated()
+    return pygame.surfarray.pixels3d(_surface).transpose(1, 0, 2)
+
+def copyPixelsTo(a):
+    """
+    Copy the RGB pixels of the canvas into the existing NumPy array a
+    of shape (height, width, 3), e.g. one slot of a preallocated batch,
+    without allocating a new array.
+    """
+    _makeSureWindowCreated()
+    pygame.pixelcopy.surface_to_array(a.transpose(1, 0, 2), _surface, 'P')
+
 #-----------------------------------------------------------------------
 
 def _show():
     """
     Copy the background canvas to the window canvas.
     """
+    if _offscreen:
+        return
     _background.blit(_surface, (0, 0))
     pygame.display.flip()
     _checkForEvents()
@@ -562,10 +845,14 @@ def show(msec=float('inf')):
     Copy the background canvas to the window canvas, and
     then wait for msec milliseconds. msec defaults to infinity.
     """
+    _makeSureWindowCreated()
+    if _offscreen:
+        # There is no window to show and no user to wait for.
+        return
+
     if msec == float('inf'):
         _showAndWaitForever()
 
-    _makeSureWindowCreated()
     _show()
     _checkForEvents()
 
@@ -629,9 +916,19 @@ def _checkForEvents():
     Check if any new event has occured (such as a key typed or button
     pressed).  If a key has been typed, then put that key in a queue.
     """
-    global _surface
-    global _keysTyped
-    
+    _makeSureWindowCreated()
+    if _offscreen:
+        return
+
+    for event in pygame.event.get():
+        _handleEvent(event)
+
+def _handleEvent(event):
+    """
+    Handle the event: exit if the window was closed, put a typed key in
+    the queue together with the time it was handled, or remember the
+    position of a mouse click.
+    """
     #-------------------------------------------------------------------
     # Begin added by Alan J. Broder
     #-------------------------------------------------------------------
@@ -640,30 +937,49 @@ def _checkForEvents():
     #-------------------------------------------------------------------
     # End added by Alan J. Broder
     #-------------------------------------------------------------------
-    
-    _makeSureWindowCreated()
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
-        elif event.type == pygame.KEYDOWN:
-            _keysTyped = [pygame.key.name(event.key)] + _keysTyped
-        elif (event.type == pygame.MOUSEBUTTONUP) and \
-            (event.button == 3):
-            _saveToFile()
-            
-        #---------------------------------------------------------------
-        # Begin added by Alan J. Broder
-        #---------------------------------------------------------------
-        # Every time the mouse button is pressed, remember
-        # the mouse position as of that press.
-        elif (event.type == pygame.MOUSEBUTTONDOWN) and \
-            (event.button == 1): 
-            _mousePressed = True
-            _mousePos = event.pos                      
-        #---------------------------------------------------------------
-        # End added by Alan J. Broder
-        #---------------------------------------------------------------
+    if event.type == pygame.QUIT:
+        sys.exit()
+    elif event.type == pygame.KEYDOWN:
+        _keysTyped.append((pygame.key.name(event.key), time.perf_counter()))
+    elif (event.type == pygame.MOUSEBUTTONUP) and \
+        (event.button == 3):
+        _saveToFile()
+        
+    #-------------------------------------------------------------------
+    # Begin added by Alan J. Broder
+    #-------------------------------------------------------------------
+    # Every time the mouse button is pressed, remember
+    # the mouse position as of that press.
+    elif (event.type == pygame.MOUSEBUTTONDOWN) and \
+        (event.button == 1): 
+        _mousePressed = True
+        _mousePos = event.pos                      
+    #-------------------------------------------------------------------
+    # End added by Alan J. Broder
+    #-------------------------------------------------------------------
+
+def waitForEvent(msec=None):
+    """
+    Block until an event occurs (such as a key typed or button pressed)
+    or until msec milliseconds have passed, without using the CPU while
+    waiting. msec defaults to waiting without a time limit. Handle the
+    event and any other pending events. Return True if an event
+    occurred, and False if the wait timed out. An off-screen canvas has
+    no events, so return False right away.
+    """
+    _makeSureWindowCreated()
+    if _offscreen:
+        return False
+    if msec is None:
+        event = pygame.event.wait()
+    else:
+        event = pygame.event.wait(int(msec))
+    if event.type == pygame.NOEVENT:
+        return False
+    _handleEvent(event)
+    _checkForEvents()
+    return True
 
 #-----------------------------------------------------------------------
 
@@ -674,23 +990,31 @@ def hasNextKeyTyped():
     Return True if the queue of the keys the user typed is not empty.
     Otherwise return False.
     """
-    global _keysTyped
-    return _keysTyped != []
+    return len(_keysTyped) > 0
 
 def nextKeyTyped():
     """
     Remove the first key from the queue of the keys that the user typed,
     and return that key.
     """
-    global _keysTyped
-    return _keysTyped.pop()
+    return _keysTyped.popleft()[0]
+
+def nextKeyEvents():
+    """
+    Remove all the keys from the queue of the keys that the user typed,
+    and return them as a list of (key, time) tuples in the order they
+    were typed. time is the time.perf_counter() value at which the key
+    was handled.
+    """
+    events = list(_keysTyped)
+    _keysTyped.clear()
+    return events
 
 def clearKeysTyped():
     """
     Clear all the keys in the queue of the keys that the user typed.
     """
-    global _keysTyped
-    _keysTyped = []
+    _keysTyped.clear()
 
 #-----------------------------------------------------------------------
 # Begin added by Alan J. Broder
@@ -746,7 +1070,6 @@ def mouseY():
 setXscale()
 setYscale()
 setPenRadius()
-pygame.font.init()
 
 #-----------------------------------------------------------------------
 
@@ -756,8 +1079,10 @@ def _getFileName():
     """
     Display a dialog box that asks the user for a file name.
     """
+    import tkinter as Tkinter
     root = Tkinter.Tk()
     root.withdraw()
+    import tkinter.filedialog as tkFileDialog
     reply = tkFileDialog.asksaveasfilename(initialdir='.')
     sys.stdout.write(reply)
     sys.stdout.flush()
@@ -767,8 +1092,10 @@ def _confirmFileSave():
     """
     Display a dialog box that confirms a file save operation.
     """
+    import tkinter as Tkinter
     root = Tkinter.Tk()
     root.withdraw()
+    import tkinter.messagebox as tkMessageBox
     tkMessageBox.showinfo(title='File Save Confirmation',
         message='The drawing was saved to the file.')
     sys.exit()
@@ -778,8 +1105,10 @@ def _reportFileSaveError(msg):
     Display a dialog box that reports a msg.  msg is a string which
     describes an error in a file save operation.
     """
+    import tkinter as Tkinter
     root = Tkinter.Tk()
     root.withdraw()
+    import tkinter.messagebox as tkMessageBox
     tkMessageBox.showerror(title='File Save Error', message=msg)
     sys.exit()
 
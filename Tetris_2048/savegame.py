@@ -0,0 +1,143 @@
+import os  # used for replacing and removing the save file
+import struct  # used for packing the fixed size fields of the save file
+import random  # used for saving and restoring the state of the random number generator
+import numpy as np  # used for packing the tile numbers and memory-mapping large boards
+from game_grid import GameGrid  # the class for modeling the game grid
+from tetromino import Tetromino  # the class for modeling the tetrominoes
+from point import Point  # used for the positions of the tetrominoes
+from tile import Tile  # used for recreating the tiles from their numbers
+
+# Layout of a save file (all values little-endian):
+#   header: magic, version, grid height, grid width, game speed, score, best score
+#   state of the random number generator: version, 625 words, whether gauss_next is set and its value
+#   the current and the next tetromino: type, size n, position (x, y) and the n x n numbers on its tiles
+#   the board: grid height x grid width tile numbers (0 for the empty cells), row 0 is the bottom row
+magic, version = b"T48S", 1
+header = struct.Struct("<4sBHHIqq")
+rng_header, rng_words = struct.Struct("<B"), 625
+rng_gauss = struct.Struct("<Bd")
+piece_header = struct.Struct("<cBii")
+# the size n of the n x n tile matrix of each type of tetromino, which is also the smallest width of a game grid
+piece_sizes = {'I': 4, 'O': 2, 'Z': 3, 'S': 3, 'J': 3, 'L': 3, 'T': 3}
+min_grid_width = max(piece_sizes.values())
+# boards stored in at least this many bytes are memory-mapped instead of read into memory
+mmap_min_bytes = 1 << 20
+
+
+# Function for packing the given tetromino
+def pack_piece(tetromino):
+    numbers = np.array([[0 if tile is None else tile.number for tile in row] for row in tetromino.tile_matrix],
+                       dtype="<i4")
+    position = tetromino.bottom_left_cell
+    return piece_header.pack(tetromino.type.encode(), len(numbers), position.x, position.y) + numbers.tobytes()
+
+
+# Function for unpacking a tetromino of a grid_h x grid_w game grid at the given offset of data, returns the
+# tetromino and the next offset, raises ValueError when the tetromino is not valid
+def unpack_piece(data, offset, grid_h, grid_w):
+    type, n, x, y = piece_header.unpack_from(data, offset)
+    type = type.decode("latin-1")
+    if piece_sizes.get(type) != n:
+        raise ValueError("not a tetromino")
+    offset += piece_header.size
+    numbers = np.frombuffer(data, dtype="<i4", count=n * n, offset=offset).reshape(n, n)
+    # the tiles have to be on the columns of the game grid, at most as high as a tetromino that was just created
+    for row, col in zip(*np.nonzero(numbers)):
+        if not (0 <= x + col < grid_w and 0 <= y + (n - 1) - row < grid_h + n - 1):
+            raise ValueError("the tetromino is outside the game grid")
+    # the tetromino is created with its type and then its (possibly rotated) tiles and position are restored
+    tetromino = Tetromino(type)
+    tetromino.tile_matrix = np.full((n, n), None)
+    for row, col in zip(*np.nonzero(numbers)):
+        tetromino.tile_matrix[row][col] = Tile(int(numbers[row, col]))
+    tetromino.bottom_left_cell = Point(x, y)
+    return tetromino, offset + numbers.nbytes
+
+
+# Function for saving the game on the given game grid (with its current and next tetromino) to file_path
+# The file is written under a temporary name and then renamed, so a crash never leaves a broken save
+def save_game(file_path, grid):
+    rng_version, words, gauss_next = random.getstate()
+    data = b"".join([
+        header.pack(magic, version, grid.grid_height, grid.grid_width, grid.game_speed, grid.score,
+                    grid.max_score or 0),
+        rng_header.pack(rng_version),
+        np.array(words, dtype="<u4").tobytes(),
+        rng_gauss.pack(gauss_next is not None, gauss_next or 0.0),
+        pack_piece(grid.current_tetromino),
+        pack_piece(grid.next_tetromino),
+        grid.get_number_matrix().astype("<i4").tobytes(),
+    ])
+    with open(file_path + ".tmp", "wb") as file:
+        file.write(data)
+    os.replace(file_path + ".tmp", file_path)
+
+
+# Function for loading the game saved in file_path, returns the game grid with its current and next
+# tetromino or None when there is no (valid) saved game
+# The random number generator is restored as well, so the game goes on exactly as it would have
+# A truncated or corrupt save file is removed, so that it does not stop the game from starting again
+def load_game(file_path, info_w, animation_speed):
+    try:
+        return read_game(file_path, info_w, animation_speed)
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError, IndexError, struct.error):
+        delete_saved_game(file_path)
+        return None
+
+
+# Function for reading the game saved in file_path, raises ValueError (or the error of the field that
+# cannot be read) when the file is not a valid save file
+def read_game(file_path, info_w, animation_speed):
+    with open(file_path, "rb") as file:
+        data = file.read(header.size)
+        if len(data) < header.size or header.unpack(data)[:2] != (magic, version):
+            raise ValueError("not a saved game of this version")
+        _, _, grid_h, grid_w, game_speed, score, max_score = header.unpack(data)
+        if grid_h < 1 or grid_w < min_grid_width or game_speed < 1:
+            raise ValueError("not a valid grid size or game speed")
+        board_bytes = grid_h * grid_w * 4
+        file_size = os.fstat(file.fileno()).st_size
+        # large boards are left on the disk to be memory-mapped, everything else is read into memory
+        if board_bytes >= mmap_min_bytes:
+            data += file.read(file_size - header.size - board_bytes)
+        else:
+            data += file.read()
+    offset = header.size
+    rng_version, = rng_header.unpack_from(data, offset)
+    offset += rng_header.size
+    words = tuple(int(word) for word in np.frombuffer(data, dtype="<u4", count=rng_words, offset=offset))
+    offset += rng_words * 4
+    has_gauss, gauss_next = rng_gauss.unpack_from(data, offset)
+    offset += rng_gauss.size
+    Tetromino.grid_height = grid_h
+    Tetromino.grid_width = grid_w
+    current_tetromino, offset = unpack_piece(data, offset, grid_h, grid_w)
+    next_tetromino, offset = unpack_piece(data, offset, grid_h, grid_w)
+    # the board has to be the rest of the file, which also keeps a corrupt grid size from being allocated
+    if file_size != offset + board_bytes:
+        raise ValueError("the board does not match the grid size")
+    grid = GameGrid(grid_h, grid_w, info_w, game_speed, animation_speed)
+    grid.score, grid.max_score = score, max_score
+    grid.current_tetromino, grid.next_tetromino = current_tetromino, next_tetromino
+    if board_bytes >= mmap_min_bytes:
+        board = np.memmap(file_path, dtype="<i4", mode="r", offset=offset, shape=(grid_h, grid_w))
+    else:
+        board = np.frombuffer(data, dtype="<i4", count=grid_h * grid_w, offset=offset).reshape(grid_h, grid_w)
+    for row, col in zip(*np.nonzero(board)):
+        grid.set_tile(int(row), int(col), Tile(int(board[row, col])))
+    # the saved board may have tiles disconnected by the row clears of the last lock (or shifted next to
+    # tiles with the same number), so all the rows are checked for flying tiles and all the columns are
+    # merged on the next lock
+    grid.unchecked_rows = set(range(grid_h))
+    grid.dirty_columns = {col: 0 for col in range(grid_w)}
+    # restore the random number generator last, as creating the tetrominoes above used it
+    random.setstate((rng_version, words, gauss_next if has_gauss else None))
+    return grid
+
+
+# Function for removing the saved game, e.g. when it is over or the player starts a new game
+def delete_saved_game(file_path):
+    if os.path.exists(file_path):
+        os.remove(file_path)
@@ -0,0 +1,118 @@
+import time  # used for reading the high-resolution clock
+import queue  # used as the queue of the keys sent to the simulation
+import threading  # used for running the simulation on its own thread
+from collections import deque  # used for passing the applied keys back to the render loop
+
+
+# Class used for running the game (applying the keys, the gravity steps and locking the tetrominoes)
+# on its own thread at the gravity rate of the game
+# After every change the simulation publishes an immutable snapshot of the game grid (see
+# GameGrid.snapshot) by replacing a single reference, which the render loop reads without locking.
+# The render loop only draws the latest snapshot and sends the keys through a queue, so a slow frame
+# never delays the gameplay and a slow lock never delays the input handling or the rendering
+class Simulation:
+    # Constructor for creating the simulation of the game on the given game grid
+    # The gravity steps are scheduled by the given clock, create_tetromino is called for creating the
+    # next tetromino, and on_lock (if given) is called on the simulation thread after each lock with
+    # the locked tetromino, the lock time, the time the tetromino was in play, the score delta and the
+    # statistics of the lock (GameGrid.lock_stats)
+    def __init__(self, grid, clock, create_tetromino, on_lock=None):
+        self.grid = grid
+        self.clock = clock
+        self.create_tetromino = create_tetromino
+        self.on_lock = on_lock
+        # the keys (with the times they were typed) and the functions to run on the simulation thread
+        self.inputs = queue.SimpleQueue()
+        # the (key, typed time) pairs of the applied keys whose effect is in the published snapshot
+        self.applied_keys = deque()
+        self.snapshot = grid.snapshot()
+        self.piece_start_time = time.perf_counter()
+        self.running = False
+        self.thread = None
+
+    # Method used for starting the simulation thread
+    def start(self):
+        self.running = True
+        self.piece_start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Method used for stopping the simulation thread, after which the game grid can be used again
+    # by the calling thread (e.g. for saving the game when it is paused)
+    def stop(self):
+        self.running = False
+        self.inputs.put(None)
+        self.thread.join()
+
+    # Method used for sending a key typed at typed_time to the simulation
+    def send_key(self, key, typed_time):
+        self.inputs.put((key, typed_time))
+
+    # Method used for running the given function on the simulation thread between two updates of the
+    # game grid, e.g. for saving the game while it is being played
+    def call(self, function):
+        self.inputs.put(function)
+
+    # Method that returns the latest published snapshot of the game grid
+    def latest_snapshot(self):
+        return self.snapshot
+
+    # Method that returns the (key, typed time) pairs of the keys applied since the last call
+    # The effect of each returned key is in the snapshot returned by latest_snapshot() after this call
+    def take_applied_keys(self):
+        applied_keys = []
+        while self.applied_keys:
+            applied_keys.append(self.applied_keys.popleft())
+        return applied_keys
+
+    # Method run by the simulation thread until the simulation is stopped or the game is over
+    def run(self):
+        while self.running and not self.grid.game_over:
+            # wait for a key until the next gravity step is due
+            try:
+                item = self.inputs.get(timeout=self.clock.time_until_gravity())
+            except queue.Empty:
+                item = None
+            applied_key = None
+            if callable(item):
+                item()
+            elif item is not None:
+                self.apply_key(item[0])
+                applied_key = item
+            if self.clock.gravity_tick():
+                self.gravity_step()
+            elif applied_key is None:
+                continue
+            self.snapshot = self.grid.snapshot()
+            # the key is handed back only after the snapshot with its effect has been published
+            if applied_key is not None:
+                self.applied_keys.append(applied_key)
+
+    # Method used for applying the given key to the current tetromino
+    def apply_key(self, key):
+        current_tetromino = self.grid.current_tetromino
+        if key in ["left", "right", "down"]:
+            current_tetromino.move(key, self.grid)
+        elif key in ["d", "a"]:
+            current_tetromino.rotate(key)
+        elif key == "space":
+            while current_tetromino.can_be_moved("down", self.grid):
+                current_tetromino.move("down", self.grid)
+
+    # Method used for moving the current tetromino down by one, and locking it on the game grid
+    # when it cannot be moved down
+    def gravity_step(self):
+        current_tetromino = self.grid.current_tetromino
+        if current_tetromino.move("down", self.grid):
+            return
+        tiles, pos = current_tetromino.get_min_bounded_tile_matrix(True)
+        lock_start_time, previous_score = time.perf_counter(), self.grid.score
+        game_over = self.grid.update_grid(tiles, pos)
+        if self.on_lock is not None:
+            self.on_lock(current_tetromino, time.perf_counter() - lock_start_time,
+                         lock_start_time - self.piece_start_time, self.grid.score - previous_score,
+                         self.grid.lock_stats)
+        self.piece_start_time = time.perf_counter()
+        if not game_over:
+            self.grid.current_tetromino = self.grid.next_tetromino
+            self.grid.next_tetromino = self.create_tetromino()
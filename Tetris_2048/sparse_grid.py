@@ -0,0 +1,138 @@
+import sys  # used for reading the command line arguments
+import time  # used for measuring the lock time in the stress test
+import random  # used for the random pieces of the stress test
+from tetromino import Tetromino  # the class for modeling the tetrominoes
+from point import Point  # used for the positions of the tiles
+from grid_rules import GridRules  # the rules of locking a tetromino shared with GameGrid
+
+
+# Class used for modeling a game grid of thousands of rows and columns whose tiles are stored sparsely
+# It follows the rules of GameGrid (GridRules: lock, merge, remove the flying tiles, clear the full rows and
+# shift) with the same results and scores, and it can be used by the tetrominoes in the same way, but only the
+# occupied cells are stored: the tiles of each column keyed by their row, with the height of each column
+# and the number of tiles in each row. The cost of a lock depends on the tiles near the locked tetromino,
+# not on the size of the grid
+class SparseGameGrid(GridRules):
+    # Constructor for creating an empty sparse game grid with the given size
+    def __init__(self, grid_h, grid_w, game_speed=0):
+        super().__init__(grid_h, grid_w)
+        self.game_speed = game_speed
+        # the tiles of each column keyed by their rows (only the columns with tiles have an entry)
+        self.columns = {}
+        # column height index: 1 + the row of the topmost tile of each column with tiles
+        self.heights = {}
+        # the number of tiles in each row with tiles, and the rows that are full
+        self.row_counts = {}
+        self.full_rows = set()
+
+    # Method that returns the tile on the given cell (None for an empty cell)
+    def get_tile(self, row, col):
+        column = self.columns.get(col)
+        return None if column is None else column.get(row)
+
+    # Method that returns the number of tiles on the game grid
+    def tile_count(self):
+        return sum(self.row_counts.values())
+
+    # Method that returns the (row, col, number) tuples of all the tiles on the game grid
+    def get_tiles(self):
+        return [(row, col, tile.number) for col, column in self.columns.items() for row, tile in column.items()]
+
+    # Method used for placing the given tile on the given cell, replacing the tile on it (if any) as
+    # GameGrid.set_tile does, e.g. when a tetromino is locked over the tiles of the top row at its spawn
+    def set_tile(self, row, col, tile):
+        column = self.columns.setdefault(col, {})
+        if row not in column:
+            self.row_counts[row] = self.row_counts.get(row, 0) + 1
+            if self.row_counts[row] == self.grid_width:
+                self.full_rows.add(row)
+        column[row] = tile
+        self.heights[col] = max(self.heights.get(col, 0), row + 1)
+
+    # Method used for removing the tile on the given occupied cell, returns the removed tile
+    def clear_tile(self, row, col):
+        column = self.columns[col]
+        tile = column.pop(row)
+        if not column:
+            del self.columns[col]
+            del self.heights[col]
+        elif self.heights[col] == row + 1:
+            self.heights[col] = max(column) + 1
+        self.row_counts[row] -= 1
+        if self.row_counts[row] == 0:
+            del self.row_counts[row]
+        self.full_rows.discard(row)
+        return tile
+
+    # Method that returns the rows of the tiles of the given column from the bottom to the top
+    def column_rows(self, col):
+        return sorted(self.columns.get(col, ()))
+
+    # Method that returns the columns of the tiles of the given row (only the columns with tiles are
+    # looked up, so the cost does not depend on the width of the grid)
+    def row_columns(self, row):
+        return [col for col, column in self.columns.items() if row in column]
+
+    # Method used for removing the tiles of the given full row and shifting the tiles above it down by
+    # one row, returns the sum of the numbers on the removed tiles
+    def remove_row_and_shift(self, row):
+        removed = sum(self.clear_tile(row, col).number for col in range(self.grid_width))
+        for col, column in self.columns.items():
+            above = sorted(r for r in column if r > row)
+            for r in above:
+                column[r - 1] = column.pop(r)
+            if above:
+                self.heights[col] -= 1
+        self.row_counts = {r - 1 if r > row else r: count for r, count in self.row_counts.items()}
+        self.full_rows = {r - 1 if r > row else r for r in self.full_rows}
+        return removed
+
+    # Method used for moving the given tetromino straight down as far as it can go (a hard drop) by
+    # looking up the tiles below it, instead of moving it down one row at a time
+    def hard_drop(self, tetromino):
+        n = len(tetromino.tile_matrix)
+        distance = None
+        for row in range(n):
+            for col in range(n):
+                if tetromino.tile_matrix[row][col] is not None:
+                    position = tetromino.get_cell_position(row, col)
+                    column = self.columns.get(position.x, {})
+                    # the topmost tile below the tile of the tetromino (-1 for the ground)
+                    if position.y >= self.heights.get(position.x, 0):
+                        below = self.heights.get(position.x, 0) - 1
+                    else:
+                        below = max((r for r in column if r < position.y), default=-1)
+                    if distance is None or position.y - below - 1 < distance:
+                        distance = position.y - below - 1
+        tetromino.bottom_left_cell.y -= distance
+
+
+# Function for the stress test of a sparse game grid of the given size with the given number of random
+# pieces dropped in random columns, returns the mean lock time in milliseconds
+def stress_test(grid_h, grid_w, pieces, seed=0):
+    random.seed(seed)
+    grid = SparseGameGrid(grid_h, grid_w)
+    total_time = 0.0
+    for _ in range(pieces):
+        tetromino = Tetromino(random.choice(['I', 'O', 'Z', 'S', 'J', 'L', 'T']), grid_h, grid_w)
+        for _ in range(random.randint(0, 3)):
+            tetromino.rotate("d")
+        tetromino.bottom_left_cell = Point(random.randint(0, grid_w - len(tetromino.tile_matrix)),
+                                           tetromino.bottom_left_cell.y)
+        grid.hard_drop(tetromino)
+        tiles, pos = tetromino.get_min_bounded_tile_matrix(True)
+        start_time = time.perf_counter()
+        game_over = grid.update_grid(tiles, pos)
+        total_time += time.perf_counter() - start_time
+        if game_over:
+            break
+    return total_time / max(1, grid.lock_count) * 1000
+
+
+# Usage: python sparse_grid.py HEIGHT WIDTH PIECES
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        print("Usage: python sparse_grid.py HEIGHT WIDTH PIECES")
+        sys.exit(1)
+    mean_lock_ms = stress_test(int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]))
+    print(f"mean lock time: {mean_lock_ms:.3f} ms")
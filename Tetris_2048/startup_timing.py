@@ -0,0 +1,73 @@
+import sys  # used for reading the command line arguments and the loaded modules
+import time  # used for reading the high-resolution clock
+import subprocess  # used for running each measurement in a fresh interpreter
+
+
+# Function for importing the game engine and simulating the first tetromino lock without drawing
+def first_simulated_step():
+    import random
+    from game_grid import GameGrid
+    from tetromino import Tetromino
+    random.seed(0)
+    Tetromino.grid_height = 18
+    Tetromino.grid_width = 12
+    grid = GameGrid(18, 12, 8, 250)
+    grid.current_tetromino = Tetromino('O')
+    while grid.current_tetromino.move("down", grid):
+        pass
+    tiles, pos = grid.current_tetromino.get_min_bounded_tile_matrix(True)
+    grid.update_grid(tiles, pos)
+
+
+# Function for importing the game and drawing its first frame on an off-screen canvas
+def first_frame():
+    import random
+    import lib.stddraw as stddraw
+    from Tetris_2048 import dimensions
+    from game_grid import GameGrid
+    from tetromino import Tetromino
+    random.seed(0)
+    stddraw.setCanvasSize(dimensions['CANVAS_WIDTH'], dimensions['CANVAS_HEIGHT'], offscreen=True)
+    grid_h, grid_w, info_w = 18, 12, dimensions['INFO_WIDTH']
+    stddraw.setXscale(-0.5, grid_w + info_w - 0.5)
+    stddraw.setYscale(-0.5, grid_h - 0.5)
+    Tetromino.grid_height = grid_h
+    Tetromino.grid_width = grid_w
+    grid = GameGrid(grid_h, grid_w, info_w, 250)
+    grid.current_tetromino = Tetromino('O')
+    grid.next_tetromino = Tetromino('T')
+    grid.display()
+
+
+measurements = {
+    'first simulated step': first_simulated_step,
+    'first frame': first_frame,
+}
+
+
+# Function for running a measurement in a fresh interpreter so that no import is cached
+# Returns the time measured inside the process (imports included), the time measured from outside
+# (interpreter start-up included) in milliseconds and whether pygame was imported by the measurement
+def measure(name):
+    start_time = time.perf_counter()
+    output = subprocess.run([sys.executable, __file__, "--child", name],
+                            capture_output=True, text=True, check=True).stdout.split()
+    total_ms = (time.perf_counter() - start_time) * 1000
+    return float(output[-2]), total_ms, output[-1] == "True"
+
+
+# Usage: python startup_timing.py [REPEATS]
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        start_time = time.perf_counter()
+        measurements[sys.argv[2]]()
+        print((time.perf_counter() - start_time) * 1000, 'pygame' in sys.modules)
+        sys.exit(0)
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name in measurements:
+        # the best run is reported as the others include noise from the rest of the system
+        results = [measure(name) for _ in range(repeats)]
+        in_process_ms = min(result[0] for result in results)
+        total_ms = min(result[1] for result in results)
+        print(f"time to {name}: {in_process_ms:.1f} ms in process, {total_ms:.1f} ms with interpreter "
+              f"start-up (pygame imported: {results[0][2]})")
@@ -0,0 +1,57 @@
+import gzip  # used for compressing the written records
+import json  # used for writing each record as a line of JSON
+import time  # used for the time stamps of the records
+import queue  # used as the bounded queue between the game loop and the writer thread
+import atexit  # used for writing the pending records before the program exits
+import threading  # used for writing the records off the game loop
+
+
+# A class for streaming gameplay metrics to a gzip compressed JSON lines file during play
+# The game loop only puts the records on a bounded queue, which is drained by a background thread
+# that writes them in batches. When the queue is full the record is dropped and counted instead
+# of making the game loop wait, and the number of dropped records is written when the writer is closed
+class TelemetryWriter:
+    # Constructor that opens the file for appending and starts the writer thread
+    # max_pending is the size of the queue and batch_size is the largest number of records written at once
+    def __init__(self, file_path, max_pending=4096, batch_size=256):
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.records = queue.Queue(max_pending)
+        # the number of records dropped because the queue was full
+        self.dropped = 0
+        self.writer = threading.Thread(target=self.write_records, daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    # Method for recording a metric of the given kind (e.g. 'lock') with the given fields
+    # The method never blocks: the record is dropped if the writer thread cannot keep up
+    def record(self, kind, **fields):
+        fields['kind'] = kind
+        fields['time'] = time.time()
+        try:
+            self.records.put_nowait(fields)
+        except queue.Full:
+            self.dropped += 1
+
+    # Method run by the writer thread: writes the queued records in batches until None is received
+    def write_records(self):
+        # each run appends a new gzip member to the file, which is still read as one gzip stream
+        with gzip.open(self.file_path, "at", encoding="utf-8") as file:
+            running = True
+            while running:
+                batch = [self.records.get()]
+                while len(batch) < self.batch_size and not self.records.empty():
+                    batch.append(self.records.get())
+                if None in batch:
+                    running = False
+                    batch = [record for record in batch if record is not None]
+                file.write("".join(json.dumps(record) + "\n" for record in batch))
+                # flush the batch so that the written records survive a crash of the game
+                file.flush()
+
+    # Method for writing the pending records (and the number of dropped records) and stopping the writer thread
+    def close(self):
+        if self.writer.is_alive():
+            self.records.put({'kind': 'telemetry', 'time': time.time(), 'dropped': self.dropped})
+            self.records.put(None)
+            self.writer.join()
@@ -0,0 +1,33 @@
+import numpy as np  # used for comparing the boards of the game grids
+from game_grid import GameGrid  # the class for modeling the game grid
+from sparse_grid import SparseGameGrid  # the class for modeling the sparse game grid
+from tile import Tile  # used for the tiles of the boards and the locked tetrominoes
+from point import Point  # used for the position of the locked tetrominoes
+
+
+# Function that returns the board of the given sparse game grid as a matrix of tile numbers
+def sparse_number_matrix(grid):
+    board = np.zeros((grid.grid_height, grid.grid_width), dtype=int)
+    for row, col, number in grid.get_tiles():
+        board[row, col] = number
+    return board
+
+
+# Test for locking a tetromino over the tiles of the top rows (as when the game is over at its spawn):
+# the replaced cells must not be counted twice, which made the rows look full and their clear fail
+def test_lock_over_occupied_top_rows():
+    grid_h, grid_w = 4, 4
+    sparse_grid, game_grid = SparseGameGrid(grid_h, grid_w), GameGrid(grid_h, grid_w, 0, 0)
+    # the first two columns are full, with numbers that do not merge
+    for row in range(grid_h):
+        for col in range(2):
+            sparse_grid.set_tile(row, col, Tile(2 if row % 2 == 0 else 4))
+            game_grid.set_tile(row, col, Tile(2 if row % 2 == 0 else 4))
+    # an O tetromino locked on the top two rows of the first two columns
+    for grid in (sparse_grid, game_grid):
+        tiles = [[Tile(8), Tile(8)], [Tile(8), Tile(8)]]
+        grid.update_grid(tiles, Point(0, grid_h - 2))
+    assert sparse_grid.row_counts == {0: 2, 1: 2, 2: 2}
+    assert not sparse_grid.full_rows
+    assert np.array_equal(sparse_number_matrix(sparse_grid), game_grid.get_number_matrix())
+    assert sparse_grid.score == game_grid.score
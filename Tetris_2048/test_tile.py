@@ -0,0 +1,45 @@
+import random  # used for the random columns of tiles
+import numpy as np  # used for the tile matrix of the reference merge
+from tile import Tile  # the class for modeling numbered tiles
+
+
+# Function for merging the tiles of the given tile matrix (row 0 is the bottom row) once from the bottom to
+# the top, as the game originally did on every lock, used as the reference for Tile.merge_column
+# Each tile with the same number as the tile above it is merged with it, and the tiles above move one row down
+# Returns the given score with the numbers of the merged tiles added
+def merge_tiles(tile_matrix, score):
+    for row, col in np.ndindex(tile_matrix.shape):
+        current_tile = tile_matrix[row, col]
+        if current_tile is not None:
+            if row < tile_matrix.shape[0] - 1 and tile_matrix[row + 1, col] is not None:
+                adjacent_tile = tile_matrix[row + 1, col]
+                if current_tile.number == adjacent_tile.number:
+                    score += current_tile.update_color_and_score(adjacent_tile)
+                    tile_matrix[row + 1, col] = None
+                    for r in range(row + 1, tile_matrix.shape[0]):
+                        if tile_matrix[r, col] is not None:
+                            tile_matrix[r - 1, col] = tile_matrix[r, col]
+                            tile_matrix[r, col] = None
+    return score
+
+
+# Test for merging random columns (with gaps) with Tile.merge_column, which must give the same tiles and score
+# as repeating the reference merge until nothing is left to merge
+def test_merge_column_matches_reference():
+    rng = random.Random(0)
+    for _ in range(2000):
+        height = rng.randint(1, 12)
+        numbers = [rng.choice([0, 2, 2, 4, 4, 8, 16]) for _ in range(height)]
+        tile_matrix = np.full((height, 1), None)
+        for row, number in enumerate(numbers):
+            if number:
+                tile_matrix[row, 0] = Tile(number)
+        score, previous_score = merge_tiles(tile_matrix, 0), None
+        while score != previous_score:
+            previous_score, score = score, merge_tiles(tile_matrix, score)
+        entries = [[row, Tile(number)] for row, number in enumerate(numbers) if number]
+        column_score, merges, lowest_row = Tile.merge_column(entries)
+        expected = [(row, tile_matrix[row, 0].number) for row in range(height) if tile_matrix[row, 0] is not None]
+        assert [(row, tile.number) for row, tile in entries] == expected
+        assert column_score == score
+        assert (merges == 0) == (lowest_row is None)
@@ -19,7 +19,11 @@ class Tetromino:
     # in the tile matrix based on the type of the tetromino
     # The tile_matrix is a 2D matrix of numbered tiles based on the shape of the
     # 7 type of tetrominoes (I, O, Z, S, J, L, T) in their initial orientation
-    def __init__(self, type):
+    # The grid size can be given for each tetromino (instead of setting the class
+    # attributes) when games with different grid sizes run in the same process
+    def __init__(self, type, grid_height=None, grid_width=None):
+        if grid_height is not None:
+            self.grid_height, self.grid_width = grid_height, grid_width
         # set the shape of the tetromino based on the given type
         self.type = type
         # determine the occupied (non-empty) tiles in the tile matrix
@@ -132,21 +136,20 @@ class Tetromino:
             blc_position.translate(min_col, (n - 1) - max_row)
             return copy, blc_position
 
-    # Method for drawing the tetromino on the game grid
-    def draw(self):
+    # Method that returns the (row, col, number) tuples of the tiles of the tetromino that are inside
+    # the game grid (the tiles above the topmost grid row are not visible)
+    def get_visible_tiles(self):
         n = len(self.tile_matrix)  # n = number of rows = number of columns
+        visible_tiles = []
         for row in range(n):
             for col in range(n):
-                # draw each occupied tile (not equal to None) on the game grid
                 if self.tile_matrix[row][col] is not None:
-                    # get the position of the tile
                     position = self.get_cell_position(row, col)
-                    # draw only the tiles that are inside the game grid
                     if position.y < self.grid_height:
-                        self.tile_matrix[row][col].draw(position)
-
-                        # Method for moving the tetromino in a given direction by 1 on the game grid
+                        visible_tiles.append((position.y, position.x, self.tile_matrix[row][col].number))
+        return visible_tiles
 
+    # Method for moving the tetromino in a given direction by 1 on the game grid
     # The direction parameter is used to determine the direction of the movement
     # The game_grid parameter is used to check if the tetromino can be moved in
     # the given direction or not by using the can_be_moved method defined below
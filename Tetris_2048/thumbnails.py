@@ -0,0 +1,59 @@
+import os  # used for building the output file names
+import sys  # used for reading the command line arguments
+import multiprocessing  # used for rendering the thumbnails in parallel worker processes
+import numpy as np  # used for reading the recorded board states
+import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
+from game_grid import GameGrid  # the class for modeling (and drawing) the game grid
+from board_renderer import BoardRenderer  # used for rasterizing the boards
+
+# the size of the off-screen canvas that is currently set in this process
+canvas_size = None
+
+
+# Function for rendering the given board state without creating a window
+# The board is a 2D array of tile numbers (0 for the empty cells) whose row 0 is the bottom row as in
+# GameGrid.get_number_matrix(). The board is drawn on an off-screen canvas of width x height pixels and saved
+# as a PNG file when file_name is given. The function returns the raw RGB bytes of the drawing
+def render_board(board, width, height, file_name=None):
+    global canvas_size
+    if canvas_size != (width, height):
+        stddraw.setCanvasSize(width, height, offscreen=True)
+        canvas_size = (width, height)
+    grid_h, grid_w = len(board), len(board[0])
+    # create a game grid without an info panel for drawing the grid lines and the boundaries
+    grid = GameGrid(grid_h, grid_w, 0, 0)
+    stddraw.setXscale(-0.5, grid_w - 0.5)
+    stddraw.setYscale(-0.5, grid_h - 0.5)
+    # rasterize the numbers directly instead of creating a tile for each cell
+    BoardRenderer.get(grid_h, grid_w).draw_number_matrix(board, grid.empty_cell_color)
+    grid.draw_grid_lines()
+    grid.draw_boundaries()
+    if file_name is not None:
+        stddraw.save(file_name)
+    return stddraw.tobytes()
+
+
+# Function used by the worker processes for rendering a (board file, output file) job
+def render_board_file(board_file, file_name, width, height):
+    render_board(np.load(board_file), width, height, file_name)
+    return file_name
+
+
+# Function for rendering the boards saved in the given .npy files as PNG thumbnails in out_dir
+# The boards are rendered in parallel by a pool of worker processes (one per CPU by default)
+def render_board_files(board_files, out_dir, width, height, processes=None):
+    jobs = []
+    for board_file in board_files:
+        name = os.path.splitext(os.path.basename(board_file))[0] + ".png"
+        jobs.append((board_file, os.path.join(out_dir, name), width, height))
+    with multiprocessing.Pool(processes) as pool:
+        return pool.starmap(render_board_file, jobs)
+
+
+# Usage: python thumbnails.py OUT_DIR WIDTH HEIGHT BOARD_FILE.npy [BOARD_FILE.npy ...]
+if __name__ == '__main__':
+    if len(sys.argv) < 5:
+        print("Usage: python thumbnails.py OUT_DIR WIDTH HEIGHT BOARD_FILE.npy [BOARD_FILE.npy ...]")
+        sys.exit(1)
+    os.makedirs(sys.argv[1], exist_ok=True)
+    render_board_files(sys.argv[4:], sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
@@ -1,7 +1,5 @@
 import random
-import numpy as np
 from tile_color import tile_colors
-import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
 from lib.color import Color  # used for coloring the tile and the number on it
 
 
@@ -13,17 +11,21 @@ class Tile:
     boundary_thickness = 0.003
     # font family and size used for displaying the tile number
     font_family, font_size = "Arial", 14
+    # the color of the box (boundary) around the tiles
+    box_color = Color(132, 122, 113)
 
-    # Constructor that creates a random tile with a number 2 or 4
+    # Constructor that creates a tile with the given number or a random tile with
+    # a number 2 or 4 when no number is given
     # ---------------------------------------------------------------------------
-    def __init__(self):
+    def __init__(self, number=None):
         self.foreground_color = None
         self.background_color = None
         random_numbers = [2, 4]
         # set the number on the tile
-        self.number = random_numbers[random.randint(0, len(random_numbers) - 1)]
-        # set the boundary color of the tile
-        self.box_color = Color(132, 122, 113)  # box (boundary) color
+        if number is None:
+            self.number = random_numbers[random.randint(0, len(random_numbers) - 1)]
+        else:
+            self.number = number
         self.update_color()
 
     # Method for updating the color of the tile based on the number on it
@@ -39,37 +41,30 @@ class Tile:
         self.update_color()
         return self.number
 
-    # Method for handling chain merge of tiles in a matrix
-    # Method find upper tile and if it is the same as current tile, call the update_color_and_score method
-    # and update the score. After that, set the upper tile to None and move all tiles above it one row down
+    # Method for merging the tiles of a single column with the same results as merging each tile with the tile
+    # above it from the bottom to the top (moving the tiles above a merge down) until nothing is left to merge,
+    # given the [row, tile] entries of the tiles in the column from the bottom to
+    # the top, which are updated in place, and the index of the first entry that may merge
+    # A merged tile can only merge again with the tile below it, so each pass starts right below the lowest
+    # merge of the previous pass instead of at the bottom of the column
+    # Returns the score of the merges, the number of merges and the lowest merged row (None if none)
     @staticmethod
-    def merge_tiles(tile_matrix, score):
-        for row, col in np.ndindex(tile_matrix.shape):
-            current_tile = tile_matrix[row, col]
-            if current_tile is not None:
-                if row < tile_matrix.shape[0] - 1 and tile_matrix[row + 1, col] is not None:
-                    adjacent_tile = tile_matrix[row + 1, col]
-                    if current_tile.number == adjacent_tile.number:
-                        score += current_tile.update_color_and_score(adjacent_tile)
-                        tile_matrix[row + 1, col] = None
-                        for r in range(row + 1, tile_matrix.shape[0]):
-                            if tile_matrix[r, col] is not None:
-                                tile_matrix[r - 1, col] = tile_matrix[r, col]
-                                tile_matrix[r, col] = None
-        return score
-
-    # Method for drawing the tile
-    def draw(self, position, length=1):
-        # draw the tile as a filled square
-        stddraw.setPenColor(self.background_color)
-        stddraw.filledSquare(position.x, position.y, length / 2)
-        # draw the bounding box around the tile as a square
-        stddraw.setPenColor(self.box_color)
-        stddraw.setPenRadius(Tile.boundary_thickness)
-        stddraw.square(position.x, position.y, length / 2)
-        stddraw.setPenRadius()  # reset the pen radius to its default value
-        # draw the number on the tile
-        stddraw.setPenColor(self.foreground_color)
-        stddraw.setFontFamily(Tile.font_family)
-        stddraw.setFontSize(Tile.font_size)
-        stddraw.text(position.x, position.y, str(self.number))
+    def merge_column(entries, start=0):
+        score, merges, lowest_row = 0, 0, None
+        while start is not None:
+            index, start = start, None
+            while index < len(entries) - 1:
+                row, tile = entries[index]
+                above_row, above_tile = entries[index + 1]
+                if above_row == row + 1 and tile.number == above_tile.number:
+                    score += tile.update_color_and_score(above_tile)
+                    del entries[index + 1]
+                    # the tiles above the merged tile move down by one row
+                    for entry in entries[index + 1:]:
+                        entry[0] -= 1
+                    merges += 1
+                    if start is None:
+                        start = max(0, index - 1)
+                        lowest_row = row if lowest_row is None else min(lowest_row, row)
+                index += 1
+        return score, merges, lowest_row
@@ -0,0 +1,124 @@
+import os  # used for checking the results file of an interrupted tournament
+import sys  # used for reading the command line arguments
+import json  # used for writing each result as a line of JSON
+import math  # used for the confidence intervals
+import random  # used for seeding the tetromino and tile sequences of the games
+import shlex  # used for splitting the command lines of the bots
+import asyncio  # used for talking to the bot of each game
+import itertools  # used for creating the (bot, seed, config) jobs
+import multiprocessing  # used for playing the games in parallel worker processes
+from bot_protocol import BotConnection, play_game  # used for playing a game against a bot process
+
+# (grid height, grid width, speed) configurations the bots are ranked on
+# The speed of a configuration is the time (in ms) the bot has to reply for each piece
+default_configs = [(18, 12, 250), (20, 16, 250), (24, 24, 100)]
+# the time (in seconds) the bot has to reply to the first piece of a game, which includes the startup of
+# the bot process (e.g. loading its interpreter and libraries), so it is not limited by the speed
+startup_timeout = 10.0
+
+
+# Function that returns the key of a (bot, seed, config) job in the results file
+def job_key(bot_name, seed, grid_h, grid_w, speed):
+    return f"{bot_name}|{seed}|{grid_h}x{grid_w}@{speed}"
+
+
+# Function for starting the bot process of a job, playing the game and stopping the bot
+# Only the replies after the first one are limited by the speed of the configuration
+async def play_bot_game(command, grid_h, grid_w, speed, max_pieces):
+    bot = await BotConnection.start_process(command)
+    try:
+        return await play_game(bot, grid_h, grid_w, max_pieces, speed / 1000, startup_timeout)
+    finally:
+        await bot.close()
+
+
+# Function run by the worker processes for playing the game of a (bot, seed, config) job
+# Every job of a seed gets the same tetromino and tile sequence, whatever the bot does, as the random
+# numbers are only drawn when a tetromino is created and each worker plays one game at a time
+# A crash of the bot (or a failure to start it) only ends its own game
+def run_job(job):
+    bot_name, command, seed, grid_h, grid_w, speed, max_pieces = job
+    random.seed(seed)
+    try:
+        score, pieces, status = asyncio.run(play_bot_game(command, grid_h, grid_w, speed, max_pieces))
+    except OSError as error:
+        score, pieces, status = 0, 0, f"error: {error}"
+    return {"key": job_key(bot_name, seed, grid_h, grid_w, speed), "bot": bot_name, "seed": seed,
+            "config": [grid_h, grid_w, speed], "score": score, "pieces": pieces, "status": status}
+
+
+# Function that returns the results in the given results file (of an interrupted tournament)
+def read_results(results_file):
+    results = []
+    if os.path.exists(results_file):
+        with open(results_file, "r") as file:
+            for line in file:
+                # the last line may be incomplete if the tournament was killed while writing it
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+    return results
+
+
+# Function for running a tournament of the given bots ({name: command line}) on n_seeds seeds of each
+# configuration with a pool of worker processes (one per CPU by default)
+# Each completed game is appended to results_file right away, so an interrupted tournament is resumed
+# by running it again with the same results file: the completed games are not played again
+# Returns all the results of the tournament
+def run_tournament(bots, results_file, n_seeds, configs=default_configs, first_seed=0, max_pieces=1000,
+                   processes=None):
+    results = read_results(results_file)
+    completed = {result["key"] for result in results}
+    jobs = [(bot_name, bots[bot_name], seed, grid_h, grid_w, speed, max_pieces)
+            for seed, (grid_h, grid_w, speed), bot_name in
+            itertools.product(range(first_seed, first_seed + n_seeds), configs, sorted(bots))
+            if job_key(bot_name, seed, grid_h, grid_w, speed) not in completed]
+    with multiprocessing.Pool(processes) as pool, open(results_file, "a") as file:
+        for result in pool.imap_unordered(run_job, jobs, chunksize=4):
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+            results.append(result)
+    return results
+
+
+# Function that returns the (number of games, mean score, half width of the 95% confidence interval of
+# the mean) of each bot in the given results, keyed by (bot, config) and by (bot, None) for all configs
+def summarize(results):
+    scores = {}
+    for result in results:
+        config = tuple(result["config"])
+        scores.setdefault((result["bot"], config), []).append(result["score"])
+        scores.setdefault((result["bot"], None), []).append(result["score"])
+    summary = {}
+    for key, values in scores.items():
+        n = len(values)
+        mean = sum(values) / n
+        variance = sum((value - mean) ** 2 for value in values) / (n - 1) if n > 1 else 0.0
+        # normal approximation of the distribution of the mean score
+        summary[key] = (n, mean, 1.96 * math.sqrt(variance / n))
+    return summary
+
+
+# Function for printing the ranking of the bots (by their mean score over all the configurations)
+def print_ranking(summary):
+    ranking = sorted((key for key in summary if key[1] is None), key=lambda key: -summary[key][1])
+    for rank, (bot_name, _) in enumerate(ranking, 1):
+        n, mean, half_width = summary[(bot_name, None)]
+        print(f"{rank}. {bot_name}: {mean:.1f} +/- {half_width:.1f} over {n} games")
+        for key in sorted(key for key in summary if key[0] == bot_name and key[1] is not None):
+            n, mean, half_width = summary[key]
+            print(f"     {key[1][0]}x{key[1][1]} @ {key[1][2]} ms: {mean:.1f} +/- {half_width:.1f} over {n} games")
+
+
+# Usage: python tournament.py RESULTS_FILE SEEDS NAME=COMMAND [NAME=COMMAND ...]
+# e.g.   python tournament.py results.jsonl 100 "random=python3 bot_protocol.py --example-bot"
+if __name__ == '__main__':
+    if len(sys.argv) < 4:
+        print("Usage: python tournament.py RESULTS_FILE SEEDS NAME=COMMAND [NAME=COMMAND ...]")
+        sys.exit(1)
+    bots = {}
+    for argument in sys.argv[3:]:
+        name, command = argument.split("=", 1)
+        bots[name] = shlex.split(command)
+    print_ranking(summarize(run_tournament(bots, sys.argv[1], int(sys.argv[2]))))